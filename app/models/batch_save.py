@@ -0,0 +1,90 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+
+class BatchSaveMixin:
+    """合并写盘：短时间内的多次修改只触发一次 _save_config
+
+    未立即写盘的修改最迟在 flush_interval 秒后由后台定时器写入，
+    因此 _save_config 可能在定时器线程（而非界面线程）中执行。
+    """
+    flush_interval = 2.0  # 距离上次写盘超过该秒数时立即写盘
+    max_pending_writes = 64  # 未写盘的修改超过该数量时立即写盘
+
+    def _init_batch_save(self) -> None:
+        self._dirty = False  # 有 _request_save 请求、尚未写盘的修改
+        self._unsaved = False  # 只在显式 save()/flush() 时写盘的修改
+        self._pending_writes = 0
+        self._last_flush = 0.0
+        self._batch_depth = 0
+        self._flush_timer = None
+        # 定时器线程与调用线程都会写盘，修改标志和写盘都在该锁内进行
+        self._flush_lock = threading.RLock()
+        atexit.register(self._flush_deferred)
+
+    def _mark_unsaved(self) -> None:
+        """标记有等待显式保存的修改，不会自动写盘"""
+        self._unsaved = True
+
+    def _discard_unsaved(self) -> None:
+        """放弃等待显式保存的修改标记（重新加载配置时使用）"""
+        self._unsaved = False
+
+    def _request_save(self) -> None:
+        """标记有修改，并按时间/数量阈值决定是否立即写盘，否则安排定时写盘"""
+        with self._flush_lock:
+            self._dirty = True
+            self._pending_writes += 1
+            if self._batch_depth:
+                return
+            elapsed = time.monotonic() - self._last_flush
+            if elapsed > self.flush_interval or self._pending_writes > self.max_pending_writes:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval - elapsed, self._on_flush_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _on_flush_timer(self) -> None:
+        with self._flush_lock:
+            self._flush_timer = None
+            if not self._batch_depth:  # 批量修改未结束时由 batch() 退出时写盘
+                self._flush_deferred()
+
+    def flush(self) -> None:
+        """立即写入所有未保存的修改"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not (self._dirty or self._unsaved):
+                return
+            self._save_config()
+            self._dirty = False
+            self._unsaved = False
+            self._pending_writes = 0
+            self._last_flush = time.monotonic()
+
+    def _flush_deferred(self) -> None:
+        """只在有 _request_save 请求时写盘；仅有等待 save() 的修改时不会写入"""
+        with self._flush_lock:
+            if self._dirty:
+                self.flush()
+
+    @contextmanager
+    def batch(self):
+        """批量修改，退出时只写盘一次
+
+        用法: with ins_mods_setting.batch(): ...
+        """
+        with self._flush_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._flush_lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.flush()
@@ -1,12 +1,86 @@
-import configparser
 import os
+import re
 import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-class BaseSetting:
+from app.models.batch_save import BatchSaveMixin
+from app.utils.file_utils import atomic_write
+
+_SENTINEL = object()
+_BOOL_MAP = {"True": True, "true": True, "False": False, "false": False}
+_TIP_SUFFIX = "_ARKToolTip"  # 配置项说明所在节的后缀
+
+# "section.key" 的拆分结果缓存，超过上限时整体清空
+_KEY_PARSE_CACHE: Dict[str, Tuple[str, str]] = {}
+_KEY_PARSE_CACHE_SIZE = 256
+
+
+def _split_section_key(section_key: str) -> Tuple[str, str]:
+    """拆分 "section.key"，没有 key 时返回空字符串"""
+    parsed = _KEY_PARSE_CACHE.get(section_key)
+    if parsed is None:
+        if len(_KEY_PARSE_CACHE) >= _KEY_PARSE_CACHE_SIZE:
+            _KEY_PARSE_CACHE.clear()
+        section, _, key = section_key.partition('.')
+        parsed = _KEY_PARSE_CACHE[section_key] = (section, key)
+    return parsed
+
+
+class FastConfigParser:
+    """轻量INI解析器，仅支持 [section] key = value 格式（无插值、无多行值）"""
+    _SECTION_RE = re.compile(r'^\[([^\]]+)\]\s*$')
+    _KV_RE = re.compile(r'^\s*([^=;#\s][^=]*?)\s*=\s*(.*?)\s*$')
+
+    def optionxform(self, optionstr: str) -> str:
+        """与 configparser 保持一致，配置项键名统一小写"""
+        return optionstr.lower()
+
+    def parse(self, text: str) -> Dict[str, Dict[str, str]]:
+        """解析INI文本为 {section: {key: value}}"""
+        data: Dict[str, Dict[str, str]] = {}
+        section = None
+        section_match = self._SECTION_RE.match
+        kv_match = self._KV_RE.match
+        optionxform = self.optionxform
+        for line in text.split('\n'):
+            match = section_match(line)
+            if match:
+                section = data.setdefault(match.group(1), {})
+                continue
+            if section is None:
+                continue
+            match = kv_match(line)
+            if match:
+                section[optionxform(match.group(1))] = match.group(2)
+        return data
+
+    def read(self, path: str) -> Dict[str, Dict[str, str]]:
+        """读取并解析INI文件"""
+        with open(path, 'rb') as f:
+            return self.parse(f.read().decode('utf-8'))
+
+    @staticmethod
+    def dumps(data: Dict[str, Dict[str, str]]) -> str:
+        """序列化为与 configparser.write 相同的格式"""
+        lines = []
+        for section, items in data.items():
+            lines.append(f"[{section}]")
+            for key, value in items.items():
+                lines.append(f"{key} = {value}")
+            lines.append("")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class BaseSetting(BatchSaveMixin):
+    """INI配置基类
+
+    读操作不加锁：写操作在 _write_lock 内复制出新的配置节字典后整体替换（写时复制），
+    读线程拿到的配置节字典加载后不会再被原地修改。
+    """
     _instance = None
     _initialized = False
     _write_lock = threading.Lock()
+    _parser = FastConfigParser()  # 解析器无状态，所有实例共用
 
     def __new__(cls, config_path: str):
         if cls._instance is None:
@@ -16,7 +90,10 @@ class BaseSetting:
     def __init__(self, config_path: str):
         if not self._initialized:
             self.config_path = config_path
-            self.config = configparser.ConfigParser()
+            self.config: Dict[str, Dict[str, str]] = {}
+            self._prop_cache: Dict[tuple, Any] = {}  # 已解码的配置值缓存
+            self._section_cache: Dict[str, Dict[str, str]] = {}  # get_section 结果缓存
+            self._init_batch_save()
             self._load_config()
             self._initialized = True
 
@@ -25,97 +102,149 @@ class BaseSetting:
         try:
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.config.read_file(f)
+                self.config = self._parser.read(self.config_path)
             else:
                 self._save_config()
-        except (configparser.Error, IOError) as e:
+        except (UnicodeDecodeError, IOError) as e:
             raise RuntimeError(f"Failed to load config: {e}")
 
+    def _reload(self, new_path: str) -> None:
+        """切换到新的配置文件：先写入旧配置中已请求写盘的修改，再复用当前实例重新加载
+
+        set()/delete() 后未点击保存的修改与原先一样直接丢弃。
+        """
+        self._flush_deferred()
+        self._discard_unsaved()
+        self.config = {}
+        self._prop_cache.clear()
+        self._section_cache.clear()
+        self.config_path = new_path
+        self._load_config()
+
     def _save_config(self) -> None:
         """保存配置到文件"""
         with self._write_lock:
             try:
-                with open(self.config_path, 'w', encoding='utf-8') as f:
-                    self.config.write(f)
+                atomic_write(self.config_path, FastConfigParser.dumps(self.config).encode('utf-8'))
             except IOError as e:
                 raise RuntimeError(f"Failed to save config: {e}")
 
     def get(self, section: str, key: str, default: Optional[Any] = "") -> Any:
         """获取配置项"""
-        try:
-            data = self.config.get(section, key)
-            if data in ("True", "False", "true", "false"):
-                return True if data in ("True", "true") else False
+        key = key.lower()
+        data = self._prop_cache.get((section, key), _SENTINEL)
+        if data is not _SENTINEL:
             return data
-        except:
+        data = self.config.get(section, {}).get(key, _SENTINEL)
+        if data is _SENTINEL:
             return default
+        data = _BOOL_MAP.get(data, data)
+        self._prop_cache[(section, key)] = data
+        return data
 
     def set(self, section: str, key: str, value: Any) -> None:
         """设置配置项"""
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-        self.config.set(section, key, str(value))
+        key = key.lower()
+        with self._write_lock:
+            section_data = dict(self.config.get(section, {}))
+            section_data[key] = str(value)
+            self.config[section] = section_data
+        self._prop_cache.pop((section, key), None)
+        self._section_cache.pop(section, None)
+        self._mark_unsaved()  # 与原先一致，等待 save()/flush() 时写盘
 
     def update_section(self, section: str, data: Dict[str, Any]) -> None:
         """批量更新配置节"""
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-        for key, value in data.items():
-            self.config.set(section, key, str(value))
-        self._save_config()
+        self.update_sections({section: data})
+
+    def update_sections(self, sections: Dict[str, Dict[str, Any]]) -> None:
+        """一次更新多个配置节，只请求一次写盘"""
+        with self._write_lock:
+            for section, data in sections.items():
+                section_data = dict(self.config.get(section, {}))
+                for key, value in data.items():
+                    section_data[key.lower()] = str(value)
+                self.config[section] = section_data
+                self._section_cache[section] = section_data
+        self._prop_cache.clear()
+        self._request_save()
 
     def delete(self, section: str, key: str) -> None:
         """删除配置项"""
-        try:
-            self.config.remove_option(section, key)
-        except configparser.NoSectionError:
-            pass
+        key = key.lower()
+        with self._write_lock:
+            section_data = self.config.get(section)
+            if section_data is not None and key in section_data:
+                section_data = dict(section_data)
+                del section_data[key]
+                self.config[section] = section_data
+        self._prop_cache.pop((section, key), None)
+        self._section_cache.pop(section, None)
+        self._mark_unsaved()
 
     def delete_section(self, section: str) -> None:
         """删除整个配置节"""
-        self.config.remove_section(section)
-        self._save_config()
+        with self._write_lock:
+            self.config.pop(section, None)
+        self._prop_cache.clear()
+        self._section_cache.pop(section, None)
+        self._request_save()
 
     def get_section(self, section: str) -> Dict[str, str]:
-        """获取整个配置节"""
-        if self.config.has_section(section):
-            return dict(self.config.items(section))
-        return {}
+        """获取整个配置节（结果会被缓存，调用方请勿修改返回的字典）"""
+        section_data = self._section_cache.get(section)
+        if section_data is None:
+            if section not in self.config:
+                return {}
+            section_data = self._section_cache[section] = dict(self.config[section])
+        return section_data
 
     def get_all_section(self):
-        return self.config.sections()
+        return list(self.config)
+
+    def get_sections_with_tips(self) -> Dict[str, Tuple[Dict[str, str], Dict[str, str]]]:
+        """一次遍历返回 {节名: (配置项, 说明)}，说明节本身不单独列出
+
+        返回的是配置内部的字典（写时复制，不会被原地修改），调用方请勿修改。
+        """
+        config = self.config
+        return {
+            name: (items, config.get(name + _TIP_SUFFIX, {}))
+            for name, items in config.items() if _TIP_SUFFIX not in name
+        }
 
     def clear(self) -> None:
         """清空配置"""
-        for section in self.config.sections():
-            self.config.remove_section(section)
-        self._save_config()
+        with self._write_lock:
+            self.config = {}
+        self._prop_cache.clear()
+        self._section_cache.clear()
+        self._request_save()
 
     def __contains__(self, section_key: str) -> bool:
         """支持 in 操作符检查节是否存在"""
-        section, _, key = section_key.partition('.')
+        section, key = _split_section_key(section_key)
         if key:
-            return self.config.has_option(section, key)
-        return self.config.has_section(section)
+            return key.lower() in self.config.get(section, {})
+        return section in self.config
 
     def __getitem__(self, section_key: str) -> Any:
         """支持字典式访问 section.key"""
-        section, _, key = section_key.partition('.')
+        section, key = _split_section_key(section_key)
         if not key:
             raise KeyError("Must specify section and key like 'section.key'")
         return self.get(section, key)
 
     def __setitem__(self, section_key: str, value: Any) -> None:
         """支持字典式设置 section.key"""
-        section, _, key = section_key.partition('.')
+        section, key = _split_section_key(section_key)
         if not key:
             raise KeyError("Must specify section and key like 'section.key'")
         self.set(section, key, value)
 
     def __delitem__(self, section_key: str) -> None:
         """支持字典式删除 section.key"""
-        section, _, key = section_key.partition('.')
+        section, key = _split_section_key(section_key)
         if not key:
             self.delete_section(section)
         else:
@@ -136,7 +265,7 @@ class ServerSetting(BaseSetting):
         self.__server_info_key = "server_info"
 
     def save(self):
-        self._save_config()
+        self.flush()
 
     def set_root_path(self, root_path: str) -> None:
         self.set(self.__server_info_key, "root_path", root_path)
@@ -234,10 +363,7 @@ class GameServerSetting(BaseSetting):
         cls._current_config_path = new_path
 
         if cls._instance:
-            # 关键修改：重新创建 ConfigParser 实例并加载新文件
-            cls._instance.config = configparser.ConfigParser()
-            cls._instance.config_path = new_path
-            cls._instance._load_config()
+            cls._instance._reload(new_path)
 
 class GameInISetting(BaseSetting):
     _instance = None
@@ -264,10 +390,7 @@ class GameInISetting(BaseSetting):
         cls._current_config_path = new_path
 
         if cls._instance:
-            # 关键修改：重新创建 ConfigParser 实例并加载新文件
-            cls._instance.config = configparser.ConfigParser()
-            cls._instance.config_path = new_path
-            cls._instance._load_config()
+            cls._instance._reload(new_path)
 
 
 
@@ -275,5 +398,3 @@ class GameInISetting(BaseSetting):
 ins_server_setting = ServerSetting()
 ins_game_setting = GameServerSetting()
 ins_game_ini_setting = GameInISetting()
-
-
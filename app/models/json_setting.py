@@ -1,25 +1,52 @@
 import json
 import os
 import threading
-from typing import Dict, Any, Optional, TypeVar, Type
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, TypeVar, Type
+
+from app.models.batch_save import BatchSaveMixin
+from app.utils.file_utils import atomic_write
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时回退到标准库json
+    orjson = None
 
 T = TypeVar('T', bound='BaseJsonSettings')
 
+_MISSING = object()
+# 只有不可变的标量值才做"未变化则不写盘"判断：dict/list 可能被调用方原地修改后再传入同一对象，
+# 此时新旧值是同一个对象，比较结果总是相等，修改会丢失
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _unchanged(old: Any, new: Any) -> bool:
+    """新值与已保存的值相同且为不可变标量"""
+    return type(new) in _SCALAR_TYPES and type(old) is type(new) and old == new
+
+
+class BaseJsonSettings(BatchSaveMixin):
+    """Base class for JSON-based configuration management
 
-class BaseJsonSettings:
-    """Base class for JSON-based configuration management"""
+    修改时替换整个 config_data（写时复制），get_all 返回的只读视图因此是稳定快照。
+    """
 
     def __init__(self, config_path: str):
         self.config_path = config_path
         self.config_data: Dict[str, Any] = {}
+        self._init_batch_save()
         self._load_config()
 
     def _load_config(self) -> None:
         """Load or create configuration file"""
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.config_data = json.load(f)
+                if orjson is not None:
+                    with open(self.config_path, 'rb') as f:
+                        self.config_data = orjson.loads(f.read())
+                else:
+                    with open(self.config_path, 'r', encoding='utf-8') as f:
+                        self.config_data = json.load(f)
             else:
                 os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
                 self.config_data = {}
@@ -30,8 +57,12 @@ class BaseJsonSettings:
     def _save_config(self) -> None:
         """Save configuration to file"""
         try:
-            with open(self.config_path, 'w+', encoding='utf-8') as f:
-                json.dump(self.config_data, f, indent=4, ensure_ascii=False)
+            # 两种方式写出的内容完全相同（2空格缩进），是否安装orjson不会改变配置文件格式
+            if orjson is not None:
+                data = orjson.dumps(self.config_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(self.config_data, indent=2, ensure_ascii=False).encode('utf-8')
+            atomic_write(self.config_path, data)
         except IOError as e:
             raise RuntimeError(f"Failed to save config: {e}")
 
@@ -40,29 +71,51 @@ class BaseJsonSettings:
         return self.config_data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        """Set configuration item"""
-        self.config_data[key] = value
-        self._save_config()
+        """Set configuration item
+
+        值为未变化的标量时不写盘；dict/list 等可变值总是写盘，原地修改后再 set 同一对象也会被保存。
+        """
+        if _unchanged(self.config_data.get(key, _MISSING), value):
+            return
+        self.config_data = {**self.config_data, key: value}
+        self._request_save()
 
     def update(self, data: Dict[str, Any]) -> None:
-        """Batch update configuration"""
-        self.config_data.update(data)
-        self._save_config()
+        """Batch update configuration
+
+        跳过未变化的标量值（判断规则同 set），全部未变化时不写盘。
+        """
+        config_data = self.config_data
+        changed = {k: v for k, v in data.items() if not _unchanged(config_data.get(k, _MISSING), v)}
+        if not changed:
+            return
+        self.config_data = {**config_data, **changed}
+        self._request_save()
 
     def delete(self, key: str) -> None:
         """Delete configuration item"""
         if key in self.config_data:
-            del self.config_data[key]
-            self._save_config()
-
-    def get_all(self) -> Dict[str, Any]:
-        """Get all configurations"""
-        return self.config_data.copy()
+            config_data = dict(self.config_data)
+            del config_data[key]
+            self.config_data = config_data
+            self._request_save()
+
+    def sync(self, data: Dict[str, Any]) -> None:
+        """Replace all configurations with data (no-op if contents and order are unchanged)"""
+        config_data = self.config_data
+        if config_data == data and list(config_data) == list(data):
+            return
+        self.config_data = dict(data)
+        self._request_save()
+
+    def get_all(self) -> Mapping[str, Any]:
+        """Get all configurations (read-only snapshot, use dict() for a mutable copy)"""
+        return MappingProxyType(self.config_data)
 
     def clear(self) -> None:
         """Clear all configurations"""
-        self.config_data.clear()
-        self._save_config()
+        self.config_data = {}
+        self._request_save()
 
     def __contains__(self, key: str) -> bool:
         """Support 'in' operator"""
@@ -129,5 +182,6 @@ class WorldInfo(BaseJsonSettings):
         with self._write_lock:
             super()._save_config()
 
+
 ins_mods_setting = ModsSetting()
 ins_world_info = WorldInfo()
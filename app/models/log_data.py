@@ -1,6 +1,16 @@
+import itertools
+import sys
 import threading
+import time
+from collections import deque
 from typing import List, Dict, Tuple, Optional
-from datetime import datetime
+
+_STRFTIME_FMT = "%Y-%m-%d %H:%M:%S"
+# 常用日志类型预先驻留，避免每条日志都生成新的字符串
+_LOG_TYPES = {t: sys.intern(t) for t in ("info", "warning", "error", "debug", "critical")}
+# 日志级别，低于最低级别的日志直接丢弃；未知类型按 info 处理
+_LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "critical": 50}
+_DEFAULT_LEVEL = _LOG_LEVELS["info"]
 
 
 class TooleLogger:
@@ -16,42 +26,89 @@ class TooleLogger:
 
     def _init_logger(self):
         """Initialize logger"""
-        self._logs: List[Dict[str, str]] = []
         self._max_logs = 100
-        self._log_lock = threading.Lock()
+        # 超出长度自动淘汰最旧日志；读取只复制一次 deque，无需加锁
+        # 以不可变的 (seq, timestamp, type, content) 元组保存，读取时无需逐条复制
+        self._logs: deque = deque(maxlen=self._max_logs)
+        # 每次修改日志后递增，读取方只需比较版本号即可判断是否有变化
+        # 新日志的 seq 即为添加后的版本号
+        self._version_counter = itertools.count(1)
+        # 写入方有多个线程，取号、追加与更新版本号需在同一把锁内完成，保证 seq 在 deque 中递增
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._cleared_version = 0  # 最近一次清空日志时的版本号
+        self._min_level = _DEFAULT_LEVEL
+
+    @property
+    def max_logs(self) -> int:
+        """最多保留的日志条数"""
+        return self._max_logs
+
+    @property
+    def version(self) -> int:
+        """日志版本号"""
+        return self._version
 
-    def add_log(self, content: str, log_type: str = "info") -> None:
+    @property
+    def min_level(self) -> str:
+        """最低记录的日志类型"""
+        for log_type, level in _LOG_LEVELS.items():
+            if level == self._min_level:
+                return log_type
+        return "info"
+
+    @min_level.setter
+    def min_level(self, log_type: str) -> None:
+        self._min_level = _LOG_LEVELS[log_type.lower()]
+
+    def add_log(self, content: str, *args, log_type: str = "info") -> None:
         """
         添加日志
-        :param content: 日志内容
+        :param content: 日志内容；传入 args 时作为 % 格式模板，只有日志会被记录时才格式化
+        :param args: 格式化参数
         :param log_type: 日志类型 (info/warning/error等)
         """
-        with self._log_lock:
-            # 创建日志条目
-            log_entry = {
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "type": log_type.lower(),
-                "content": content
-            }
-
-            # 添加日志
-            self._logs.append(log_entry)
-
-            # 限制日志数量
-            if len(self._logs) > self._max_logs:
-                self._logs.pop(0)
-
-    def get_all_logs(self) -> List[Dict[str, str]]:
+        log_type = log_type.lower()
+        if _LOG_LEVELS.get(log_type, _DEFAULT_LEVEL) < self._min_level:
+            return
+        log_type = _LOG_TYPES.get(log_type) or sys.intern(log_type)
+        if args:
+            content = content % args
+
+        # 添加日志（超过 _max_logs 时自动丢弃最旧的一条）
+        timestamp = time.strftime(_STRFTIME_FMT)
+        with self._write_lock:
+            seq = next(self._version_counter)
+            self._logs.append((seq, timestamp, log_type, content))
+            self._version = seq
+
+    def get_all_logs(self) -> Tuple[Tuple[int, str, str, str], ...]:
         """
         获取全部日志
-        :return: 日志列表，按时间从旧到新排序
+        :return: (seq, timestamp, type, content) 元组，按时间从旧到新排序
         """
-        with self._log_lock:
-            return self._logs.copy()
+        return tuple(self._logs)
+
+    def get_logs_since(self, version: int) -> Tuple[bool, Tuple[Tuple[int, str, str, str], ...]]:
+        """
+        获取指定版本号之后新增的日志
+        :param version: 上次读取时的版本号
+        :return: (是否在此期间清空过日志, 新增日志)；清空过时返回当前全部日志
+        """
+        logs = tuple(self._logs)
+        if version < self._cleared_version:
+            return True, logs
+        # 新日志都在末尾，从后往前找到第一条已读取的日志
+        start = len(logs)
+        while start and logs[start - 1][0] > version:
+            start -= 1
+        return False, logs[start:]
 
     def clear_logs(self) -> None:
         """清空日志"""
-        with self._log_lock:
+        with self._write_lock:
             self._logs.clear()
+            self._cleared_version = self._version = next(self._version_counter)
+
 
 ins_tool_logger = TooleLogger()
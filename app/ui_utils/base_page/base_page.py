@@ -1,5 +1,51 @@
 from PySide6.QtWidgets import QDialog, QMessageBox, QInputDialog
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QObject, QEvent
+
+# Qt 枚举常量只在导入时查找一次
+_YES = QMessageBox.Yes
+_NO = QMessageBox.No
+_OK = QMessageBox.Ok
+_YES_NO = _YES | _NO
+_INFO = QMessageBox.Information
+_MODAL = Qt.ApplicationModal
+
+# 视为"确认"的按钮
+_ACCEPT = (_YES, _OK)
+
+
+def _layout_with_no(msg_box, button_yes_text, button_no_text):
+    """是/否 双按钮"""
+    msg_box.setStandardButtons(_YES_NO)
+    msg_box.setButtonText(_NO, button_no_text)
+    msg_box.setButtonText(_YES, button_yes_text)
+
+
+def _layout_without_no(msg_box, button_yes_text, button_no_text):
+    """单个确定按钮"""
+    msg_box.setStandardButtons(_OK)
+    msg_box.setButtonText(_OK, "确定")  # 单按钮时默认使用"确定"
+
+
+_LAYOUTS = {True: _layout_with_no, False: _layout_without_no}
+
+
+class _WheelEater(QObject):
+    """吞掉滚轮事件的事件过滤器，所有下拉框共用一个实例"""
+
+    def eventFilter(self, obj, event):
+        return event.type() == QEvent.Wheel
+
+
+_WHEEL_EATER = None
+
+
+def disable_wheel(widget):
+    """禁止控件响应滚轮，只有获得焦点时才能键盘操作"""
+    global _WHEEL_EATER
+    if _WHEEL_EATER is None:
+        _WHEEL_EATER = _WheelEater()
+    widget.setFocusPolicy(Qt.StrongFocus)
+    widget.installEventFilter(_WHEEL_EATER)
 
 
 class BasePage(QDialog):
@@ -11,8 +57,8 @@ class BasePage(QDialog):
                     title="提示",
                     button_yes_text="是",
                     button_no_text="",
-                    message_type=QMessageBox.Information,
-                    default_button=QMessageBox.Yes):
+                    message_type=_INFO,
+                    default_button=_YES):
         """
         通用消息框方法
 
@@ -38,24 +84,15 @@ class BasePage(QDialog):
         msg_box.setText(content)
         msg_box.setIcon(message_type)
 
-        # 根据是否有取消按钮决定按钮组合
-        if button_no_text:
-            msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
-            msg_box.setButtonText(QMessageBox.No, button_no_text)
-        else:
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            button_yes_text = "确定"  # 单按钮时默认使用"确定"
-
-        # 设置确认按钮文本
-        msg_box.setButtonText(QMessageBox.Yes if button_no_text else QMessageBox.Ok, button_yes_text)
+        # 根据是否有取消按钮决定按钮组合及确认按钮文本
+        _LAYOUTS[bool(button_no_text)](msg_box, button_yes_text, button_no_text)
         msg_box.setDefaultButton(default_button)
 
         # 设置窗口模态
-        msg_box.setWindowModality(Qt.ApplicationModal)
+        msg_box.setWindowModality(_MODAL)
 
         # 执行消息框并返回布尔结果
-        result = msg_box.exec()
-        return result == QMessageBox.Yes or result == QMessageBox.Ok
+        return msg_box.exec() in _ACCEPT
 
 
     def input_dialog(self, title, label, default_text=""):
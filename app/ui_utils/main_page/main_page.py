@@ -20,7 +20,7 @@ class MainPage(MainPage_ServerOpen, MainPage_WorldConfigSet, MainPage_ModsSet, M
 
     def cross_update_show_world_config(self):
         '''跨tab界面的子类调用的，更新配置文件'''
-        MainPage_ServerOpen.refresh_world_config_options(self)
+        MainPage_ServerOpen.refresh_world_config_options(self, force=True)
 
 
 
@@ -1,21 +1,27 @@
 import os
-import re
-from typing import Tuple, Optional, Dict
-from PySide6.QtWidgets import (QDialog, QFileDialog, QTableWidgetItem,
-                               QHeaderView, QMessageBox, QTableWidget, QComboBox)
+from collections import Counter
+from typing import Tuple
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QMessageBox
 from PySide6.QtCore import Qt
 
 from app.models.ini_settings import ins_server_setting
 from app.models.json_setting import ins_world_info
 from app.ui_utils.base_page.base_page import BasePage
+from app.ui_utils.main_page.server_open_page.world_table_model import (
+    COL_WORLD_SET, ComboDelegate, WorldTableModel, make_world_row)
 from src.ui.main_page.ui_main_page import Ui_MainPage
 
 
 class ServerOpen_Widget(BasePage, Ui_MainPage):
+    _WORLD_CONFIG_DIR = "config/game_settings"
+    _DEFAULT_INI = "default.ini"
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._world_config_options = []  # 存储世界配置选项
+        self._editor_rows = set()  # 已打开世界配置下拉框的行
+        self._cfg_dir_mtime = None  # 上次扫描时配置目录的 st_mtime_ns
+        self._config_set = frozenset()  # 当前配置名集合，用于判断选项是否变化
 
     def widget_init(self):
         self.__setup_ui()
@@ -24,67 +30,107 @@ class ServerOpen_Widget(BasePage, Ui_MainPage):
         self.refresh_world_config_options()  # 初始化时加载一次配置
 
 
-    def refresh_world_config_options(self):
-        """刷新世界配置选项并更新UI"""
-        config_dir = "config/game_settings"
-        old_options = self._world_config_options.copy()
-        self._world_config_options = ["default"]  # 默认包含default
+    def refresh_world_config_options(self, force=False):
+        """刷新世界配置选项并更新UI
 
+        切换到启动页面时调用，配置目录的修改时间未变化时直接返回；
+        新建/复制配置后以 force=True 调用，总是重新扫描
+        （文件系统时间精度较低时，新建的配置可能不会改变目录修改时间）。
+        """
         try:
-            if os.path.exists(config_dir):
-                for file in os.listdir(config_dir):
-                    if file.endswith(".ini"):
-                        config_name = file[:-4]  # 去掉.ini后缀
-                        if config_name != "default":  # 避免重复添加default
-                            self._world_config_options.append(config_name)
+            try:
+                mtime = os.stat(self._WORLD_CONFIG_DIR).st_mtime_ns
+            except FileNotFoundError:
+                mtime = -1
+            if not force and mtime == self._cfg_dir_mtime:
+                return
+            self._cfg_dir_mtime = mtime
+
+            options, has_default = self.__scan_world_configs(self._WORLD_CONFIG_DIR)
 
             # 检查default.ini是否存在
-            if not os.path.exists(os.path.join(config_dir, "default.ini")):
+            if not has_default:
                 self.message_box("default.ini配置丢失", "错误(Error)", message_type=QMessageBox.Critical)
 
             # 如果选项有变化，则更新UI
-            if old_options != self._world_config_options:
-                self.__update_world_config_comboboxes()
+            new_set = frozenset(options)
+            if new_set != self._config_set:
+                self._config_set = new_set
+                self._world_config_options = options
+                # 共用的选项模型会同步到所有下拉框，这里只需恢复各行的选择
+                self._world_config_delegate.options = options
+                self.__restore_world_config_selections()
 
         except Exception as e:
             self.message_box(f"加载配置失败: {str(e)}", "错误(Error)", message_type=QMessageBox.Critical)
 
-    def __update_world_config_comboboxes(self):
-        """更新所有行的世界配置下拉框，并保留原来的选择"""
-        for row in range(self.choose_world_show.rowCount()):
-            combo = self.choose_world_show.cellWidget(row, 5)
-            if combo:
-                # 获取当前选择的值
-                current_value = combo.currentText()
-
-                # 保存当前下拉框的信号连接
-                # 我们需要先断开信号，否则clear()会触发信号
-                combo.blockSignals(True)
-
-                # 更新下拉框选项
-                combo.clear()
-                combo.addItems(self._world_config_options)
-
-                # 尝试恢复原来的选择
-                new_index = combo.findText(current_value)
-                if new_index >= 0:
-                    combo.setCurrentIndex(new_index)
-                else:
-                    # 如果原来的选项不存在，尝试从数据源获取
-                    world_id = self.choose_world_show.item(row, 0).text()
-                    if world_id:
-                        world_data = ins_world_info.get(world_id, {})
-                        saved_config = world_data.get('world_set', 'default')
-                        saved_index = combo.findText(saved_config)
-                        combo.setCurrentIndex(saved_index if saved_index >= 0 else 0)
-                    else:
-                        combo.setCurrentIndex(0)
-                # 恢复信号连接
-                combo.blockSignals(False)
+    def __scan_world_configs(self, config_dir: str) -> Tuple[list, bool]:
+        """一次 scandir 得到配置列表及default.ini是否存在"""
+        options = ["default"]  # 默认包含default
+        has_default = False
+        if not os.path.isdir(config_dir):
+            return options, has_default
+        with os.scandir(config_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not name.endswith(".ini") or not entry.is_file(follow_symlinks=False):
+                    continue
+                if name == self._DEFAULT_INI:  # 避免重复添加default
+                    has_default = True
+                    continue
+                options.append(name[:-4])  # 去掉.ini后缀
+        return options, has_default
+
+    def __restore_world_config_selections(self):
+        """选项变化后恢复各行的选择，原选项已不存在的行回退到第一个配置"""
+        options = self._config_set
+        fallback = self._world_config_options[0]
+        for row_data in self._world_model.rows():
+            if row_data["world_set"] not in options:
+                row_data["world_set"] = fallback
+        rows = self._world_model.rowCount()
+        if rows:
+            # 已打开的下拉框通过 setEditorData 恢复选择
+            self._world_model.dataChanged.emit(
+                self._world_model.index(0, COL_WORLD_SET),
+                self._world_model.index(rows - 1, COL_WORLD_SET),
+            )
 
-                # 禁止下拉框的滚轮事件
-                combo.setFocusPolicy(Qt.StrongFocus)  # 确保只有获得焦点时才能键盘操作
-                combo.wheelEvent = lambda event: None  # 禁用滚轮事件
+    def __sync_config_editors(self, *args):
+        """只为可见行打开世界配置下拉框，滚出视口的行关闭编辑器"""
+        view = self.choose_world_show
+        rows = self._world_model.rowCount()
+        if rows:
+            first = view.rowAt(0)
+            last = view.rowAt(view.viewport().height() - 1)
+            visible = set(range(max(first, 0), (last if last >= 0 else rows - 1) + 1))
+        else:
+            visible = set()
+        for row in self._editor_rows - visible:
+            view.closePersistentEditor(self._world_model.index(row, COL_WORLD_SET))
+        for row in visible - self._editor_rows:
+            view.openPersistentEditor(self._world_model.index(row, COL_WORLD_SET))
+        self._editor_rows = visible
+
+    def __on_world_rows_inserted(self, parent, first, last):
+        """插入行后其后的行号后移"""
+        inserted = last - first + 1
+        self._editor_rows = {row if row < first else row + inserted for row in self._editor_rows}
+        self.__sync_config_editors()
+
+    def __on_world_model_reset(self):
+        """模型重置时视图会关闭所有编辑器"""
+        self._editor_rows = set()
+        self.__sync_config_editors()
+
+    def __on_world_rows_removed(self, parent, first, last):
+        """删除行后编辑器随行一起销毁，其后的行号前移"""
+        removed = last - first + 1
+        self._editor_rows = {
+            row if row < first else row - removed
+            for row in self._editor_rows if not first <= row <= last
+        }
+        self.__sync_config_editors()
 
     def public_server_map_save(self):
         '''对子类暴露保存接口'''
@@ -92,98 +138,44 @@ class ServerOpen_Widget(BasePage, Ui_MainPage):
 
     def __setup_ui(self):
         """Initialize UI components"""
-        # Set table properties
-        self.choose_world_show.setColumnCount(7)  # 新增一列
-        self.choose_world_show.setHorizontalHeaderLabels([
-            "地图ID\n(MapID)",
-            "地图名称\n(MapName)",
-            "游戏端口\n(GamePort)",
-            "RCON端口\n(RCONPort)",
-            "是否启用\n(Enabled)",
-            "世界配置\n(WorldConfig)",
-            "服务器名称\n(SessionName)"
-        ])
+        self._world_model = WorldTableModel(self)
+        self._world_config_delegate = ComboDelegate(self)
+        self.choose_world_show.setModel(self._world_model)
+        self.choose_world_show.setItemDelegateForColumn(COL_WORLD_SET, self._world_config_delegate)
 
-        # 设置表头居中
+        # 设置表头居中，所有列等宽拉伸（单参数重载作用于全部列）
         header = self.choose_world_show.horizontalHeader()
         header.setDefaultAlignment(Qt.AlignCenter)
+        header.setSectionResizeMode(QHeaderView.Stretch)
 
-
-        # 设置所有列内容居中
-        for col in range(self.choose_world_show.columnCount()):
-            self.choose_world_show.horizontalHeader().setSectionResizeMode(col, QHeaderView.Stretch)
-
-        self.choose_world_show.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.choose_world_show.setSelectionMode(QTableWidget.SingleSelection)
-        self.choose_world_show.setSelectionBehavior(QTableWidget.SelectRows)
-        self.choose_world_show.setEditTriggers(QTableWidget.DoubleClicked | QTableWidget.EditKeyPressed)
+        self.choose_world_show.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.choose_world_show.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.choose_world_show.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
 
     def __connect_signals(self):
         """Connect UI signals to slots"""
         self.more_world_delete.clicked.connect(self.__delete_selected_world)
         self.more_world_save.clicked.connect(self.__save_world_data)
         self.more_world_add.clicked.connect(self.__add_new_world)
+        # 滚动或视口大小变化时按可见行打开/关闭下拉框
+        self.choose_world_show.verticalScrollBar().valueChanged.connect(self.__sync_config_editors)
+        self.choose_world_show.verticalScrollBar().rangeChanged.connect(self.__sync_config_editors)
+        self._world_model.rowsInserted.connect(self.__on_world_rows_inserted)
+        self._world_model.rowsRemoved.connect(self.__on_world_rows_removed)
+        self._world_model.modelReset.connect(self.__on_world_model_reset)
+        # 切换回启动页面时检查配置目录是否有变化（如在外部新增了配置文件）
+        self.main_tabWidget.currentChanged.connect(self.__on_main_tab_changed)
+
+    def __on_main_tab_changed(self, index):
+        if self.main_tabWidget.widget(index) is self.tab:
+            self.refresh_world_config_options()
 
     def __load_world_data(self):
         """Load world data from ins_world_info and populate the table"""
-        self.choose_world_show.setRowCount(0)  # Clear existing data
-
-        for world_id, world_data in ins_world_info.get_all().items():
-            row_position = self.choose_world_show.rowCount()
-            self.choose_world_show.insertRow(row_position)
-
-            # Add world key (not editable)
-            key_item = QTableWidgetItem(world_id)
-            key_item.setFlags(key_item.flags() & ~Qt.ItemIsEditable)
-            key_item.setTextAlignment(Qt.AlignCenter)
-            self.choose_world_show.setItem(row_position, 0, key_item)
-
-            # Add world name (editable)
-            name_item = QTableWidgetItem(world_data.get('name', ''))
-            name_item.setTextAlignment(Qt.AlignCenter)
-            self.choose_world_show.setItem(row_position, 1, name_item)
-
-            # Add game port (editable)
-            port_item = QTableWidgetItem(str(world_data.get('port', '')))
-            port_item.setTextAlignment(Qt.AlignCenter)
-            self.choose_world_show.setItem(row_position, 2, port_item)
-
-            # Add RCON port (editable)
-            rcon_item = QTableWidgetItem(str(world_data.get('rcon_port', '')))
-            rcon_item.setTextAlignment(Qt.AlignCenter)
-            self.choose_world_show.setItem(row_position, 3, rcon_item)
-
-            # Add enabled checkbox
-            enabled_item = QTableWidgetItem()
-            enabled_item.setFlags(enabled_item.flags() | Qt.ItemIsUserCheckable)
-            enabled_item.setTextAlignment(Qt.AlignCenter)
-            enabled_item.setCheckState(Qt.Checked if world_data.get('open', False) else Qt.Unchecked)
-            enabled_item.setFlags(enabled_item.flags() & ~Qt.ItemIsEditable)
-            self.choose_world_show.setItem(row_position, 4, enabled_item)
-
-            # Add world config combobox (新增列)
-            combo = QComboBox()
-            combo.addItems(self._world_config_options)
-
-            # 禁止下拉框的滚轮事件
-            combo.setFocusPolicy(Qt.StrongFocus)  # 确保只有获得焦点时才能键盘操作
-            combo.wheelEvent = lambda event: None  # 禁用滚轮事件
-
-            # 设置当前选中的配置
-            current_config = world_data.get('world_set', 'default')
-            index = combo.findText(current_config)
-            if index >= 0:
-                combo.setCurrentIndex(index)
-            else:
-                combo.setCurrentIndex(0)  # 默认选择default
-
-            # 将combobox放入表格
-            self.choose_world_show.setCellWidget(row_position, 5, combo)
-
-
-            session_item = QTableWidgetItem(str(world_data.get('session_name', '')))
-            session_item.setTextAlignment(Qt.AlignCenter)
-            self.choose_world_show.setItem(row_position, 6, session_item)
+        self._world_model.set_rows([
+            make_world_row(world_id, world_data, id_locked=True)
+            for world_id, world_data in ins_world_info.get_all().items()
+        ])
 
     def __delete_selected_world(self):
         """Delete the selected world from the table (not saved until save button clicked)"""
@@ -197,8 +189,9 @@ class ServerOpen_Widget(BasePage, Ui_MainPage):
             return
 
         selected_row = selected_rows[0].row()
-        world_id = self.choose_world_show.item(selected_row, 0).text()
-        world_name = self.choose_world_show.item(selected_row, 1).text()
+        row_data = self._world_model.rows()[selected_row]
+        world_id = row_data["id"]
+        world_name = row_data["name"]
 
         # Confirm deletion
         if self.message_box(
@@ -208,7 +201,7 @@ class ServerOpen_Widget(BasePage, Ui_MainPage):
                 "取消(Cancel)",
                 QMessageBox.Question
         ):
-            self.choose_world_show.removeRow(selected_row)
+            self._world_model.remove_row(selected_row)
             self.message_box(
                 f"已删除！保存生效！(Deleted! Please Save by yourself!)",
                 "成功(Success)"
@@ -216,141 +209,70 @@ class ServerOpen_Widget(BasePage, Ui_MainPage):
 
     def __add_new_world(self):
         """Add a new empty row to the table"""
-        row_position = self.choose_world_show.rowCount()
-        self.choose_world_show.insertRow(row_position)
-
-        # Add empty key (editable)
-        key_item = QTableWidgetItem("")
-        self.choose_world_show.setItem(row_position, 0, key_item)
-
-        # Add empty name (editable)
-        name_item = QTableWidgetItem("")
-        self.choose_world_show.setItem(row_position, 1, name_item)
-
-        # Add empty port (editable)
-        port_item = QTableWidgetItem("")
-        self.choose_world_show.setItem(row_position, 2, port_item)
-
-        # Add empty RCON port (editable)
-        rcon_item = QTableWidgetItem("")
-        self.choose_world_show.setItem(row_position, 3, rcon_item)
-
-        # Add disabled checkbox by default
-        enabled_item = QTableWidgetItem()
-        enabled_item.setFlags(enabled_item.flags() | Qt.ItemIsUserCheckable)
-        enabled_item.setCheckState(Qt.Unchecked)
-        enabled_item.setFlags(enabled_item.flags() & ~Qt.ItemIsEditable)
-        self.choose_world_show.setItem(row_position, 4, enabled_item)
-
-        # Add world config combobox for new row
-        combo = QComboBox()
-        combo.addItems(self._world_config_options)
-        # 禁止下拉框的滚轮事件
-        combo.setFocusPolicy(Qt.StrongFocus)  # 确保只有获得焦点时才能键盘操作
-        combo.wheelEvent = lambda event: None  # 禁用滚轮事件
-        combo.setCurrentIndex(0)  # 默认选择default
-        combo.currentTextChanged.connect(lambda text, row=row_position: self.__update_world_config(text, row))
-        self.choose_world_show.setCellWidget(row_position, 5, combo)
-
-
-        session_item = QTableWidgetItem("")
-        self.choose_world_show.setItem(row_position, 6, session_item)
+        new_row = make_world_row()
+        # 默认选择第一个配置(default)
+        if self._world_config_options:
+            new_row["world_set"] = self._world_config_options[0]
+        self._world_model.append_row(new_row)
 
         self.message_box(
             "已添加新行，请填写信息后点击保存! (New row added, please fill in information and click save!)",
             "提示(Info)"
         )
 
-    def __validate_world_data(self, world_id, port, rcon_port, existing_keys, existing_ports, existing_rcon_ports):
-        """Validate world data before saving"""
-        if not world_id:
-            self.message_box(
-                "Map ID不能为空! (Map ID cannot be empty!)",
-                "错误(Error)",
-                message_type=QMessageBox.Critical
-            )
-            return False
-
-        if world_id in existing_keys:
-            self.message_box(
-                f"Map ID '{world_id}' 已存在! (Key '{world_id}' already exists!)",
-                "错误(Error)",
-                message_type=QMessageBox.Critical
-            )
-            return False
-
+    def __save_world_data(self, ignore_success_tip=False):
+        """Save changes from table back to ins_world_info"""
         try:
-            port = int(port)
-            if port in existing_ports:
-                self.message_box(
-                    f"游戏端口 {port} 已被使用! (Game port {port} is already in use!)",
-                    "错误(Error)",
-                    message_type=QMessageBox.Critical
-                )
-                return False
-        except ValueError:
-            self.message_box(
-                "游戏端口必须为数字! (Game port must be a number!)",
-                "错误(Error)",
-                message_type=QMessageBox.Critical
-            )
-            return False
+            # First pass: parse every row once, collect format errors
+            rows = self._world_model.rows()
+            parsed = []  # (row, world_id, port, rcon_port)
+            validation_errors = []
 
-        try:
-            rcon_port = int(rcon_port)
-            if rcon_port in existing_rcon_ports:
+            for row, row_data in enumerate(rows):
+                prefix = f"第{row + 1}行(Row {row + 1}): "
+                world_id = row_data["id"].strip()
+                if not world_id:
+                    validation_errors.append(prefix + "Map ID不能为空! (Map ID cannot be empty!)")
+
+                try:
+                    port = int(row_data["port"].strip())
+                except ValueError:
+                    port = None
+                    validation_errors.append(prefix + "游戏端口必须为数字! (Game port must be a number!)")
+
+                try:
+                    rcon_port = int(row_data["rcon_port"].strip())
+                except ValueError:
+                    rcon_port = None
+                    validation_errors.append(prefix + "RCON端口必须为数字! (RCON port must be a number!)")
+
+                parsed.append((row, world_id, port, rcon_port))
+
+            # Duplicate check: one Counter per column, each duplicated value reported once
+            duplicate_checks = (
+                (1, "Map ID '{0}' 已存在! (Key '{0}' already exists!)"),
+                (2, "游戏端口 {0} 已被使用! (Game port {0} is already in use!)"),
+                (3, "RCON端口 {0} 已被使用! (RCON port {0} is already in use!)"),
+            )
+            for position, template in duplicate_checks:
+                counts = Counter(item[position] for item in parsed if item[position] not in ("", None))
+                for value, count in counts.items():
+                    if count > 1:
+                        dup_rows = ", ".join(str(item[0] + 1) for item in parsed if item[position] == value)
+                        validation_errors.append(f"第{dup_rows}行(Row {dup_rows}): " + template.format(value))
+
+            if validation_errors:
                 self.message_box(
-                    f"RCON端口 {rcon_port} 已被使用! (RCON port {rcon_port} is already in use!)",
+                    "\n".join(validation_errors),
                     "错误(Error)",
                     message_type=QMessageBox.Critical
                 )
                 return False
-        except ValueError:
-            self.message_box(
-                "RCON端口必须为数字! (RCON port must be a number!)",
-                "错误(Error)",
-                message_type=QMessageBox.Critical
-            )
-            return False
-
-        return True
 
-    def __save_world_data(self, ignore_success_tip=False):
-        """Save changes from table back to ins_world_info"""
-        try:
-            # Create collections to check for duplicates
-            existing_keys = set()
-            existing_ports = set()
-            existing_rcon_ports = set()
-
-            # First pass: collect all data and validate
             updated_worlds = {}
-            validation_errors = []
-
-            for row in range(self.choose_world_show.rowCount()):
-                world_id = self.choose_world_show.item(row, 0).text().strip()
-                world_name = self.choose_world_show.item(row, 1).text().strip()
-                port_str = self.choose_world_show.item(row, 2).text().strip()
-                rcon_port_str = self.choose_world_show.item(row, 3).text().strip()
-                enabled = self.choose_world_show.item(row, 4).checkState() == Qt.Checked
-                session_str = self.choose_world_show.item(row, 6).text().strip()
-
-                # 获取世界配置
-                combo = self.choose_world_show.cellWidget(row, 5)
-                world_config = combo.currentText() if combo else "default"
-
-                if not self.__validate_world_data(
-                        world_id, port_str, rcon_port_str,
-                        existing_keys, existing_ports, existing_rcon_ports
-                ):
-                    return False
-
-                # Add to collections if validation passed
-                existing_keys.add(world_id)
-                port = int(port_str)
-                existing_ports.add(port)
-                rcon_port = int(rcon_port_str)
-                existing_rcon_ports.add(rcon_port)
+            for row, world_id, port, rcon_port in parsed:
+                row_data = rows[row]
+                session_str = row_data["session_name"].strip()
 
                 # 如果没有session_str
                 if not session_str:
@@ -358,20 +280,20 @@ class ServerOpen_Widget(BasePage, Ui_MainPage):
                         session_str = ins_server_setting.server_session_name + "_" + world_id
                     else:
                         session_str = "ARK_SERVER_" + world_id
-                    self.choose_world_show.item(row, 6).setText(session_str)
+                    self._world_model.set_value(row, "session_name", session_str)
 
                 updated_worlds[world_id] = {
-                    'name': world_name,
+                    'name': row_data["name"].strip(),
                     'port': port,
                     'rcon_port': rcon_port,
-                    'open': enabled,
-                    'world_set': world_config,
+                    'open': row_data["open"],
+                    'world_set': row_data["world_set"] or "default",  # 获取世界配置
                     "session_name": session_str,
                 }
 
             # Second pass: update ins_world_info if all validations passed
-            ins_world_info.clear()
-            ins_world_info.update(updated_worlds)
+            ins_world_info.sync(updated_worlds)
+            ins_world_info.flush()  # 点击保存立即写盘
 
             if not ignore_success_tip:
                 self.message_box(
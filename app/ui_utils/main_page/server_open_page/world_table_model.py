@@ -0,0 +1,172 @@
+from typing import Any, Dict, List
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSignalBlocker, QStringListModel, Qt
+from PySide6.QtWidgets import QComboBox, QStyledItemDelegate
+
+from app.ui_utils.base_page.base_page import disable_wheel
+
+# 列顺序与表头一致，值为行字典中的键
+WORLD_COLUMNS = ("id", "name", "port", "rcon_port", "open", "world_set", "session_name")
+WORLD_HEADERS = (
+    "地图ID\n(MapID)",
+    "地图名称\n(MapName)",
+    "游戏端口\n(GamePort)",
+    "RCON端口\n(RCONPort)",
+    "是否启用\n(Enabled)",
+    "世界配置\n(WorldConfig)",
+    "服务器名称\n(SessionName)",
+)
+COL_ID = 0
+COL_OPEN = 4
+COL_WORLD_SET = 5
+
+
+def make_world_row(world_id: str = "", world_data: Dict[str, Any] = None, id_locked: bool = False) -> Dict[str, Any]:
+    """由 ins_world_info 中的一条记录生成表格行"""
+    world_data = world_data or {}
+    return {
+        "id": world_id,
+        "name": world_data.get("name", ""),
+        "port": str(world_data.get("port", "")),
+        "rcon_port": str(world_data.get("rcon_port", "")),
+        "open": bool(world_data.get("open", False)),
+        "world_set": world_data.get("world_set", "default"),
+        "session_name": str(world_data.get("session_name", "")),
+        "id_locked": id_locked,  # 已保存的地图不允许修改ID
+    }
+
+
+class WorldTableModel(QAbstractTableModel):
+    """地图列表数据模型，每行一个字典"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Dict[str, Any]] = []
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return self._rows
+
+    def set_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """整体替换数据"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def append_row(self, row_data: Dict[str, Any]) -> int:
+        """追加一行，返回行号"""
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(row_data)
+        self.endInsertRows()
+        return row
+
+    def remove_row(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+    def set_value(self, row: int, key: str, value: Any) -> None:
+        """修改单元格并通知视图"""
+        self._rows[row][key] = value
+        index = self.index(row, WORLD_COLUMNS.index(key))
+        self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(WORLD_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return WORLD_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        value = self._rows[index.row()][WORLD_COLUMNS[column]]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if column == COL_OPEN:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if value else Qt.Unchecked
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return value
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        column = index.column()
+        if column == COL_OPEN:
+            if role != Qt.CheckStateRole:
+                return False
+            value = Qt.CheckState(value) == Qt.Checked
+        elif role != Qt.EditRole:
+            return False
+        row_data = self._rows[index.row()]
+        key = WORLD_COLUMNS[column]
+        if row_data[key] == value:
+            return True
+        row_data[key] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        column = index.column()
+        if column == COL_OPEN:
+            return flags | Qt.ItemIsUserCheckable
+        if column == COL_ID and self._rows[index.row()]["id_locked"]:
+            return flags
+        return flags | Qt.ItemIsEditable
+
+
+class ComboDelegate(QStyledItemDelegate):
+    """世界配置列的下拉框，仅对打开编辑器的行创建 QComboBox
+
+    所有下拉框共用同一个 QStringListModel，修改选项时无需逐个重新填充。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._options_model = QStringListModel(self)
+        self._resetting = False  # 替换选项期间下拉框的选择变化不写回模型
+
+    @property
+    def options(self) -> List[str]:
+        return self._options_model.stringList()
+
+    @options.setter
+    def options(self, options: List[str]) -> None:
+        self._resetting = True
+        try:
+            self._options_model.setStringList(options)
+        finally:
+            self._resetting = False
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.setModel(self._options_model)
+        # 禁止下拉框的滚轮事件
+        disable_wheel(combo)
+        combo.currentIndexChanged.connect(self._on_current_index_changed)
+        return combo
+
+    def setEditorData(self, editor, index):
+        with QSignalBlocker(editor):
+            found = editor.findText(index.data(Qt.EditRole))
+            editor.setCurrentIndex(found if found >= 0 else 0)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+    def _on_current_index_changed(self):
+        """选择变化后立即写回模型"""
+        if not self._resetting:
+            self.commitData.emit(self.sender())
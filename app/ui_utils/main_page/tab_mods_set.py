@@ -2,15 +2,15 @@ import os
 import subprocess
 
 from PySide6.QtWidgets import (
-    QMessageBox,
     QTableWidgetItem,
     QAbstractItemView,
-    QCheckBox,
-    QWidget,
-    QHBoxLayout,
-    QHeaderView
+    QHeaderView,
+    QApplication,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QSignalBlocker, QEvent
 from PySide6.QtGui import QColor
 
 from app.models.json_setting import ins_mods_setting
@@ -18,6 +18,67 @@ from app.ui_utils.base_page.base_page import BasePage
 from src.ui.main_page.ui_main_page import Ui_MainPage
 
 
+def _make_item_prototypes():
+    """ID列和复选框列的单元格原型，填充时 clone() 复用标志和背景"""
+    id_item = QTableWidgetItem()
+    id_item.setFlags(id_item.flags() & ~Qt.ItemIsEditable)
+    id_item.setBackground(QColor(240, 240, 240))
+
+    enabled_item = QTableWidgetItem()
+    enabled_item.setFlags((enabled_item.flags() | Qt.ItemIsUserCheckable) & ~Qt.ItemIsEditable)
+    return id_item, enabled_item
+
+
+_ID_ITEM, _ENABLED_ITEM = _make_item_prototypes()
+
+
+class _CenteredCheckDelegate(QStyledItemDelegate):
+    """复选框居中显示的单元格（QStyledItemDelegate 默认把复选框画在单元格左侧）"""
+
+    @staticmethod
+    def _style(option):
+        return option.widget.style() if option.widget else QApplication.style()
+
+    def _check_rect(self, option):
+        """居中的复选框区域"""
+        opt = QStyleOptionViewItem(option)
+        opt.features |= QStyleOptionViewItem.HasCheckIndicator
+        size = self._style(opt).subElementRect(QStyle.SE_ItemViewItemCheckIndicator, opt, opt.widget).size()
+        return QStyle.alignedRect(opt.direction, Qt.AlignCenter, size, opt.rect)
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = self._style(opt)
+        checked = opt.checkState == Qt.Checked
+        check_rect = self._check_rect(opt)
+
+        # 先画不带复选框的背景和选中效果，再在中间画复选框
+        opt.features &= ~QStyleOptionViewItem.HasCheckIndicator
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+        opt.rect = check_rect
+        opt.state = (opt.state & ~QStyle.State_HasFocus) | (QStyle.State_On if checked else QStyle.State_Off)
+        style.drawPrimitive(QStyle.PE_IndicatorItemViewItemCheck, opt, painter, opt.widget)
+
+    def editorEvent(self, event, model, option, index):
+        flags = index.flags()
+        if not (flags & Qt.ItemIsUserCheckable and flags & Qt.ItemIsEnabled):
+            return False
+        event_type = event.type()
+        if event_type in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            if event.button() != Qt.LeftButton or not self._check_rect(option).contains(event.position().toPoint()):
+                return False
+            if event_type != QEvent.MouseButtonRelease:
+                return True  # 按下/双击不切换，避免与松开重复
+        elif event_type == QEvent.KeyPress:
+            if event.key() not in (Qt.Key_Space, Qt.Key_Select):
+                return False
+        else:
+            return False
+        checked = Qt.CheckState(index.data(Qt.CheckStateRole)) == Qt.Checked
+        return model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+
+
 class MainPage_ModsSet(BasePage, Ui_MainPage):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -37,11 +98,17 @@ class MainPage_ModsSet(BasePage, Ui_MainPage):
         self.mods_show_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.mods_show_table.setEditTriggers(QAbstractItemView.DoubleClicked)
 
-        # 列宽设置
-        self.mods_show_table.setColumnWidth(0, 100)  # ID列
-        self.mods_show_table.setColumnWidth(1, 150)  # Name列
-        self.mods_show_table.setColumnWidth(3, 80)  # 复选框列
-        self.mods_show_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        # 列宽设置，完成后表头只重绘一次
+        header = self.mods_show_table.horizontalHeader()
+        header.setUpdatesEnabled(False)
+        try:
+            self.mods_show_table.setColumnWidth(0, 100)  # ID列
+            self.mods_show_table.setColumnWidth(1, 150)  # Name列
+            self.mods_show_table.setColumnWidth(3, 80)  # 复选框列
+            self.mods_show_table.setItemDelegateForColumn(3, _CenteredCheckDelegate(self.mods_show_table))
+            header.setSectionResizeMode(2, QHeaderView.Stretch)
+        finally:
+            header.setUpdatesEnabled(True)
 
     def __bind_events(self):
         """绑定所有UI控件的事件"""
@@ -66,17 +133,19 @@ class MainPage_ModsSet(BasePage, Ui_MainPage):
         try:
             # Install certificate to Trusted Root Certification Authorities store
             # 将证书安装到受信任根证书颁发机构存储
-            command = f'certutil -addstore "Root" "{os.path.abspath(cert_path)}"'
+            # 以参数列表直接启动程序，不经过 cmd.exe
+            abs_cert_path = os.path.abspath(cert_path)
 
             # Run with admin privileges 以管理员权限运行
             if self.__is_admin():
-                result = subprocess.run(command, shell=True, check=True,
+                result = subprocess.run(["certutil", "-addstore", "Root", abs_cert_path], check=True,
                                         capture_output=True, text=True, encoding='gbk')
             else:
                 # Try to run with elevated privileges 尝试以提升权限运行
-                command = f'powershell -Command "Start-Process cmd -Verb RunAs -ArgumentList \'/c {command}\'"'
-                result = subprocess.run(command, shell=True, check=True,
-                                        capture_output=True, text=True, encoding='gbk')
+                command = f'certutil -addstore "Root" "{abs_cert_path}"'
+                result = subprocess.run(
+                    ["powershell", "-Command", f"Start-Process cmd -Verb RunAs -ArgumentList '/c {command}'"],
+                    check=True, capture_output=True, text=True, encoding='gbk')
 
             if result.returncode == 0:
                 self.message_box("证书安装成功！\n(Certificate installed successfully!)")
@@ -93,33 +162,47 @@ class MainPage_ModsSet(BasePage, Ui_MainPage):
     def __is_admin(self):
         """Check if running with admin privileges 检查是否以管理员权限运行"""
         try:
-            return subprocess.run('net session', shell=True,
+            return subprocess.run(["net", "session"],
                                   stderr=subprocess.PIPE, stdout=subprocess.PIPE).returncode == 0
         except:
             return False
 
     def __load_data(self):
         """从配置加载数据到表格"""
-        self.mods_show_table.setRowCount(0)
+        table = self.mods_show_table
+        all_mods = ins_mods_setting.get_all()
 
-        for mod_id in ins_mods_setting:
-            mod_data = ins_mods_setting[mod_id]
-            self.__add_row_to_table(
-                mod_id,
-                mod_data.get("name", ""),
-                mod_data.get("bak", ""),
-                mod_data.get("open", False)
-            )
+        # 批量填充期间暂停重绘、信号和排序，结束后统一刷新
+        sorting_enabled = table.isSortingEnabled()
+        table.setUpdatesEnabled(False)
+        table.setSortingEnabled(False)
+        try:
+            with QSignalBlocker(table):
+                table.setRowCount(0)
+                table.setRowCount(len(all_mods))  # 预先分配行，避免逐行 insertRow
+                for row_pos, (mod_id, mod_data) in enumerate(all_mods.items()):
+                    self.__fill_row(
+                        row_pos,
+                        mod_id,
+                        mod_data.get("name", ""),
+                        mod_data.get("bak", ""),
+                        mod_data.get("open", False)
+                    )
+        finally:
+            table.setSortingEnabled(sorting_enabled)
+            table.setUpdatesEnabled(True)
 
     def __add_row_to_table(self, mod_id: str, name: str, description: str, enabled: bool):
         """添加一行数据到表格"""
         row_pos = self.mods_show_table.rowCount()
         self.mods_show_table.insertRow(row_pos)
+        self.__fill_row(row_pos, mod_id, name, description, enabled)
 
+    def __fill_row(self, row_pos: int, mod_id: str, name: str, description: str, enabled: bool):
+        """填充表格中已存在的一行"""
         # ID列（不可编辑）
-        id_item = QTableWidgetItem(mod_id)
-        id_item.setFlags(id_item.flags() & ~Qt.ItemIsEditable)
-        id_item.setBackground(QColor(240, 240, 240))
+        id_item = _ID_ITEM.clone()
+        id_item.setText(mod_id)
         self.mods_show_table.setItem(row_pos, 0, id_item)
 
         # Name列
@@ -131,15 +214,9 @@ class MainPage_ModsSet(BasePage, Ui_MainPage):
         self.mods_show_table.setItem(row_pos, 2, desc_item)
 
         # Checkbox列
-        checkbox_widget = QWidget()
-        checkbox_layout = QHBoxLayout(checkbox_widget)
-        checkbox_layout.setContentsMargins(0, 0, 0, 0)
-        checkbox_layout.setAlignment(Qt.AlignCenter)
-
-        checkbox = QCheckBox()
-        checkbox.setChecked(enabled)
-        checkbox_layout.addWidget(checkbox)
-        self.mods_show_table.setCellWidget(row_pos, 3, checkbox_widget)
+        enabled_item = _ENABLED_ITEM.clone()
+        enabled_item.setCheckState(Qt.Checked if enabled else Qt.Unchecked)
+        self.mods_show_table.setItem(row_pos, 3, enabled_item)
 
     def __on_add_mods(self):
         """添加新模组"""
@@ -169,33 +246,31 @@ class MainPage_ModsSet(BasePage, Ui_MainPage):
     def __on_save_mods(self):
         """保存所有修改（全量更新）"""
         try:
-            # 清空原有配置
-            ins_mods_setting.clear()
-
             # 遍历表格所有行，重新构建配置
-            for row in range(self.mods_show_table.rowCount()):
-                mod_id_item = self.mods_show_table.item(row, 0)
+            table = self.mods_show_table
+            updated_mods = {}
+            for row in range(table.rowCount()):
+                mod_id_item = table.item(row, 0)
                 if not mod_id_item:
                     continue
 
-                mod_id = mod_id_item.text()
-
                 # 获取复选框状态
-                checkbox_widget = self.mods_show_table.cellWidget(row, 3)
-                if not checkbox_widget:
+                enabled_item = table.item(row, 3)
+                if not enabled_item:
                     continue
 
-                checkbox = checkbox_widget.findChild(QCheckBox)
-                if not checkbox:
-                    continue
-
-                # 更新配置
-                ins_mods_setting[mod_id] = {
-                    "name": self.mods_show_table.item(row, 1).text() if self.mods_show_table.item(row, 1) else "",
-                    "bak": self.mods_show_table.item(row, 2).text() if self.mods_show_table.item(row, 2) else "",
-                    "open": checkbox.isChecked()
+                name_item = table.item(row, 1)
+                desc_item = table.item(row, 2)
+                updated_mods[mod_id_item.text()] = {
+                    "name": name_item.text() if name_item else "",
+                    "bak": desc_item.text() if desc_item else "",
+                    "open": enabled_item.checkState() == Qt.Checked
                 }
 
+            # 与原有配置一致时不写盘；有变化时点击保存立即写盘
+            ins_mods_setting.sync(updated_mods)
+            ins_mods_setting.flush()
+
             self.message_box(content=f"全部修改已保存!(All changes saved successfully!)", title="Success")
 
         except Exception as e:
@@ -10,16 +10,31 @@ from app.models.json_setting import ins_world_info
 from app.models.log_data import ins_tool_logger
 from app.ui_utils.main_page.server_open_page.tab_server_open_widget import ServerOpen_Widget
 from app.utils.start_game import OpenServer
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
 
-class ServerWorker(QObject):
+# 校验用正则，导入时编译一次
+_PWD_RE = re.compile(r'^[a-zA-Z0-9]+$')
+_CLUSTER_ID_RE = re.compile(r'^[a-zA-Z0-9_]+$')
+
+
+class ServerWorkerSignals(QObject):
     """
-    服务器工作线程
+    服务器任务的信号，QRunnable 本身不能发信号
     """
 
     reset_button = Signal(bool)
     self_finished = Signal()
 
+
+class ServerRunnable(QRunnable):
+    """
+    服务器启动任务，在全局线程池中执行
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.signals = ServerWorkerSignals()
+
     def run(self):
         ins_tool_logger.add_log("Start...")
         try:
@@ -27,12 +42,11 @@ class ServerWorker(QObject):
         except Exception as e:
             ins_tool_logger.add_log(traceback.format_exc())
         finally:
-            self.reset_button.emit(True)
+            self.signals.reset_button.emit(True)
         # 提示界面可以在此点击开始了
-        self.self_finished.emit()
+        self.signals.self_finished.emit()
         ins_tool_logger.add_log("End...")
-        # 退出
-        self.thread().quit()
+
 
 class MainPage_ServerOpen(ServerOpen_Widget):
 
@@ -40,7 +54,6 @@ class MainPage_ServerOpen(ServerOpen_Widget):
         super().__init__(parent)
         self.choose_root = ""
         self.choose_cluster_path = ""
-        self.worker_thread = None
         self.worker = None
         self.worker_finished = True
 
@@ -155,13 +168,12 @@ class MainPage_ServerOpen(ServerOpen_Widget):
         # 如果没有路径
         if not self.choose_cluster_path:
             self.choose_cluster_path = os.path.join(self.choose_root, cluster_id)
-            if not os.path.exists(self.choose_cluster_path):
-                os.mkdir(self.choose_cluster_path)
+            os.makedirs(self.choose_cluster_path, exist_ok=True)
             self.cluster_path.setText(self.choose_cluster_path)
         # 开始写入
         ins_server_setting.set_server_pwd(server_pwd)
         ins_server_setting.set_admin_pwd(admin_pwd)
-        ins_server_setting.set_max_player(int(max_player))
+        ins_server_setting.set_max_player(max_player)
         ins_server_setting.set_cluster_id(cluster_id)
         ins_server_setting.set_cluster_path(self.choose_cluster_path)
         ins_server_setting.set_server_session_name(server_session_name)
@@ -177,50 +189,6 @@ class MainPage_ServerOpen(ServerOpen_Widget):
             self.message_box("配置保存成功！(Save Success!)", button_yes_text="OK")
         return True
 
-    def __validate_pwd(self, pwd: str, field_name: str) -> Tuple[bool, Optional[str]]:
-        """验证密码格式（仅英文+数字）
-
-        参数:
-            pwd: 待验证的密码字符串
-            field_name: 字段名称（用于错误提示）
-
-        返回:
-            Tuple[是否有效, 错误信息]
-        """
-        if not re.match(r'^[a-zA-Z0-9]+$', pwd):
-            return False, f"密码只能包含字母和数字(password only number or letters)"
-        return True, ""
-
-    def __validate_max_player(self, max_player: str) -> Tuple[bool, Optional[str]]:
-        """验证最大玩家数
-
-        参数:
-            max_player: 待验证的字符串
-
-        返回:
-            Tuple[是否有效, 错误信息]
-        """
-        try:
-            num = int(max_player)
-            if num <= 0:
-                return False, "最大玩家数必须大于0(Max player must be greater than 0)"
-            return True, ""
-        except ValueError:
-            return False, "请输入有效的数字(Max player must be integer)"
-
-    def __validate_cluster_id(self, cluster_id: str) -> Tuple[bool, Optional[str]]:
-        """验证并处理集群数据
-
-        参数:
-            cluster_id: 待验证的字符串
-
-        返回:
-            Tuple[处理后的值, 错误信息]
-        """
-        if not re.match(r'^[a-zA-Z0-9_]+$', cluster_id):
-            return False, "集群ID只能包含字母、数字和下划线(Cluster ID only number or letters or _)"
-        return True, ""
-
     def __validate_cluster_path(self, cluster_path: str) -> Tuple[bool, Optional[str]]:
         """验证并处理集群路径
 
@@ -231,7 +199,7 @@ class MainPage_ServerOpen(ServerOpen_Widget):
         返回:
             Tuple[处理后的值, 错误信息]
         """
-        if not os.path.exists(cluster_path):
+        if not os.path.isdir(cluster_path):
             return False, "多通数据路径不存在！(Cluster Path does not exist)"
         return True, ""
 
@@ -239,7 +207,7 @@ class MainPage_ServerOpen(ServerOpen_Widget):
             self,
             server_pwd: str,
             admin_pwd: str,
-            max_player: str,
+            max_player: int,
             cluster_id: str,
             cluster_path: str,
             server_session_name: str
@@ -257,29 +225,22 @@ class MainPage_ServerOpen(ServerOpen_Widget):
         返回:
             Tuple[是否全部有效, 处理后的字段值, 错误信息]
         """
-        errors = {}
-        validated = {}
-
-        # 验证密码
-        valid, err = self.__validate_pwd(server_pwd, "服务器密码(server_pwd)")
-        if not valid:
-            return False, err
-
-        valid, err = self.__validate_pwd(admin_pwd, "管理员密码")
-        if not valid:
-            return False, err
-
-        # 验证最大玩家数
-        valid, err = self.__validate_max_player(max_player)
-        if not valid:
-            return False, err
-
-        # 验证集群ID
+        # 正则校验一次遍历完成；集群ID为空时不校验
+        pwd_err = "密码只能包含字母和数字(password only number or letters)"
+        checks = [
+            (_PWD_RE, server_pwd, pwd_err),
+            (_PWD_RE, admin_pwd, pwd_err),
+        ]
         if cluster_id:
-            valid, err = self.__validate_cluster_id(cluster_id)
-            if not valid:
+            checks.append((_CLUSTER_ID_RE, cluster_id, "集群ID只能包含字母、数字和下划线(Cluster ID only number or letters or _)"))
+        for pattern, text, err in checks:
+            if not pattern.match(text):
                 return False, err
 
+        # 验证最大玩家数（QSpinBox 已保证为整数）
+        if max_player <= 0:
+            return False, "最大玩家数必须大于0(Max player must be greater than 0)"
+
         if cluster_id and not cluster_path:
             return False, "填写存档ID则必须填写存档路径,两个都不填写则自动设置默认路径！(To fill in the Cluter ID, you must provide the Cluster path. If neither is filled in, the default path will be automatically set!)"
 
@@ -311,13 +272,14 @@ class MainPage_ServerOpen(ServerOpen_Widget):
             self.__set_run_button(True)
             return
 
-        # 提取开启地图数量
-        world_data = ins_world_info.get_all()
-        # 遍历
+        # 提取开启地图数量，只需区分0、1和多个，数到2个即停止
+        all_worlds = ins_world_info.get_all()
         open_counts = 0
-        for map_id in world_data:
-            if world_data[map_id]["open"]:
+        for world_data in all_worlds.values():
+            if world_data.get("open"):
                 open_counts += 1
+                if open_counts > 1:
+                    break
         # 如果还是0
         if open_counts <= 0:
             self.message_box("你必须先选则至少一个地图才能开启服务器！(You must select at least one map before you can start the server!)")
@@ -330,6 +292,8 @@ class MainPage_ServerOpen(ServerOpen_Widget):
             return
         # 大于1个世界给出提示
         if open_counts > 1:
+            # 提示中需要准确数量，此时再完整统计
+            open_counts = sum(1 for world_data in all_worlds.values() if world_data.get("open"))
             message_tip = f"你开启了{open_counts}个世界，每个世界大概会占用10G内存，点击确认继续启动服务器！(You have opened {open_counts} worlds. Each world will approximately occupy 10G of memory. Click 'Confirm' to continue and start the server!)"
             if not self.message_box(message_tip, button_yes_text="确认(Confirm)", button_no_text="取消(Cancel)"):
                 self.__set_run_button(True)
@@ -338,16 +302,11 @@ class MainPage_ServerOpen(ServerOpen_Widget):
         if not self.worker_finished:
             self.message_box("服务器正在启动中，请稍候(Server is opening, please wait...)")
             return
-        # 服务器开启
-        self.worker_thread = QThread()
-        self.worker_thread.finished.connect(lambda: self.worker_thread.deleteLater())
-        self.worker = ServerWorker()
-        self.worker_thread.started.connect(self.worker.run)
-        self.worker.reset_button.connect(self.__set_run_button)
-        self.worker.self_finished.connect(self.__set_finished_status)
-
-        self.worker.moveToThread(self.worker_thread)
-        self.worker_thread.start()
+        # 服务器开启，复用全局线程池
+        self.worker = ServerRunnable()
+        self.worker.signals.reset_button.connect(self.__set_run_button)
+        self.worker.signals.self_finished.connect(self.__set_finished_status)
+        QThreadPool.globalInstance().start(self.worker)
         self.worker_finished = False
         self.main_tabWidget.setCurrentIndex(3)
 
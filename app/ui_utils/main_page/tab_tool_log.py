@@ -1,6 +1,6 @@
-import hashlib
 import os
 import re
+from collections import deque
 from PySide6.QtCore import Signal
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QDialog, QMessageBox, QTableWidgetItem, QInputDialog, QHeaderView
@@ -8,36 +8,43 @@ from app.models.ini_settings import ins_game_setting
 from app.models.log_data import ins_tool_logger
 from app.ui_utils.base_page.base_page import BasePage
 from src.ui.main_page.ui_main_page import Ui_MainPage
-from PySide6.QtCore import QObject, Signal, QThread, QTimer
+from PySide6.QtCore import QObject, Signal, Slot, QThread, QTimer
 from PySide6.QtGui import Qt, QTextCursor
 
 
 class LogWorker(QObject):
-    """日志工作线程（带MD5去重）"""
-    log_updated = Signal(str)  # 日志更新信号
+    """日志工作线程（按日志版本号去重）"""
+    log_updated = Signal(list)  # 新增日志条目 (seq, timestamp, type, content)，由界面线程格式化
+    log_reset = Signal()  # 日志被清空
 
     def __init__(self):
         super().__init__()
-        self.timer = QTimer()
+        self.timer = None  # 线程启动后在工作线程中创建
+        self.last_version = 0  # 已发送日志的版本号
+
+    @Slot()
+    def _on_started(self):
+        """线程启动后创建定时器，使 timeout 在工作线程中触发"""
+        self.timer = QTimer(self)
         self.timer.timeout.connect(self.fetch_logs)
         self.timer.start(1000)  # 1秒触发一次
-        self.last_md5 = None  # 保存上一次日志的MD5值
+        # 线程退出前在本线程停止定时器
+        self.thread().finished.connect(self.timer.stop)
 
     def fetch_logs(self):
         """获取日志并检查变化"""
-        all_logs = ins_tool_logger.get_all_logs()
-        log_text = "\n".join(
-            f"[{log['timestamp']}] {log['type'].upper()}: {log['content']}"
-            for log in all_logs
-        )
-
-        # 计算当前日志的MD5
-        current_md5 = hashlib.md5(log_text.encode('utf-8')).hexdigest()
+        version = ins_tool_logger.version
+        # 日志未变化时不拼接文本
+        if version == self.last_version:
+            return
 
-        # 仅当MD5变化时发送信号
-        if current_md5 != self.last_md5:
-            self.log_updated.emit(log_text)
-            self.last_md5 = current_md5  # 更新MD5记录
+        # 日志只会追加，每次只发送上次之后新增的部分
+        reset, new_logs = ins_tool_logger.get_logs_since(self.last_version)
+        self.last_version = max(version, new_logs[-1][0]) if new_logs else version
+        if reset:
+            self.log_reset.emit()
+        if new_logs:
+            self.log_updated.emit(list(new_logs))
 
 
 class MainPage_ToolLog(BasePage, Ui_MainPage):
@@ -45,6 +52,7 @@ class MainPage_ToolLog(BasePage, Ui_MainPage):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.log_worker = None
+        self._entry_lines = deque()  # 界面中每条日志占用的行数（文本块数），从旧到新
 
     def ins_init(self):
         self.log_thread = QThread()
@@ -52,17 +60,38 @@ class MainPage_ToolLog(BasePage, Ui_MainPage):
 
         self.log_worker.moveToThread(self.log_thread)
         self.log_worker.log_updated.connect(self.update_log_display)
+        self.log_worker.log_reset.connect(self.__clear_log_display)
+        self.log_thread.started.connect(self.log_worker._on_started)
         self.log_thread.start()
 
 
-    def update_log_display(self, log_text):
-        """更新日志显示（主线程执行）"""
+    def update_log_display(self, new_logs):
+        """追加新增日志（主线程执行）"""
         # 保存当前滚动条位置
         scrollbar = self.mp_show_logs.verticalScrollBar()
         at_bottom = scrollbar.value() == scrollbar.maximum()
 
-        # 更新文本
-        self.mp_show_logs.setPlainText(log_text)
+        # 在文档末尾以纯文本追加，不影响用户当前的光标和选择
+        document = self.mp_show_logs.document()
+        text = "\n".join(
+            f"[{timestamp}] {log_type.upper()}: {content}"
+            for _, timestamp, log_type, content in new_logs
+        )
+        if not document.isEmpty():
+            text = "\n" + text
+        end_cursor = QTextCursor(document)
+        end_cursor.movePosition(QTextCursor.End)
+        end_cursor.insertText(text)
+
+        # 与日志缓存条数一致：超出时删除最早的日志条目（多行日志整条删除）
+        entry_lines = self._entry_lines
+        entry_lines.extend(content.count("\n") + 1 for _, _, _, content in new_logs)
+        excess = len(entry_lines) - ins_tool_logger.max_logs
+        if excess > 0:
+            blocks = sum(entry_lines.popleft() for _ in range(excess))
+            head = QTextCursor(document)
+            head.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor, blocks)
+            head.removeSelectedText()
 
         # 如果之前已经在底部，则保持滚动到底部
         if at_bottom:
@@ -71,6 +100,10 @@ class MainPage_ToolLog(BasePage, Ui_MainPage):
             self.mp_show_logs.setTextCursor(cursor)
             self.mp_show_logs.ensureCursorVisible()
 
+    def __clear_log_display(self):
+        self._entry_lines.clear()
+        self.mp_show_logs.clear()
+
     def closeEvent(self, event):
         """清理资源"""
         self.log_thread.quit()
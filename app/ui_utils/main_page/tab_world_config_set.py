@@ -1,14 +1,37 @@
 import os
-import re
+import shutil
+import string
 import traceback
+from collections import defaultdict
 
 from PySide6.QtCore import Signal
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QDialog, QMessageBox, QTableWidgetItem, QInputDialog, QHeaderView
+from PySide6.QtCore import Qt, QSignalBlocker, QTimer
+from PySide6.QtWidgets import QDialog, QMessageBox, QInputDialog, QHeaderView
 from app.models.ini_settings import ins_game_setting, ins_game_ini_setting
-from app.ui_utils.base_page.base_page import BasePage
+from app.ui_utils.base_page.base_page import BasePage, disable_wheel
+from app.ui_utils.main_page.world_config_model import WorldConfigModel, default_tip
 from src.ui.main_page.ui_main_page import Ui_MainPage
 
+# 配置文件名允许的字符：字母、数字、下划线和连字符
+_CONFIG_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+# 世界配置目录：GameUserSettings.ini 在根目录，Game.ini 在 game_ini 子目录
+_CONFIG_DIR = "config/game_settings"
+_GAME_INI_DIR = os.path.join(_CONFIG_DIR, "game_ini")
+# 新建配置文件的初始内容
+_EMPTY_CONFIG = "[ServerSettings]\n[ServerSettings_ARKToolTip]\n"
+
+
+def _is_valid_config_name(config_name):
+    """配置名非空且只包含允许的字符"""
+    return bool(config_name) and all(c in _CONFIG_NAME_CHARS for c in config_name)
+
+
+def _config_file_paths(config_name):
+    """返回配置对应的 (GameUserSettings.ini路径, Game.ini路径)"""
+    file_name = config_name + ".ini"
+    return os.path.join(_CONFIG_DIR, file_name), os.path.join(_GAME_INI_DIR, file_name)
+
 
 class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
     update_world_config_signal = Signal()  # 新增信号
@@ -16,8 +39,12 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_config = "default"  # 当前选中的配置文件(不带.ini)
+        self._reload_pending = False  # 已安排延迟重建表格
+        self._config_index = {}  # 配置名 -> 下拉框索引，与下拉框内容同步
 
     def ins_init(self):
+        # 配置目录只在初始化时确保存在一次
+        os.makedirs(_GAME_INI_DIR, exist_ok=True)
         self.__setup_ui()
         self.__bind_events()
         self.__load_config_list()
@@ -25,23 +52,21 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
 
     def __setup_ui(self):
         """初始化UI设置(Initialize UI settings)"""
-        # 设置表格属性(Set table properties)
-        self.wc_show_world_setting.setColumnCount(5)
-        self.wc_show_world_setting.setHorizontalHeaderLabels(
-            ["配置文件(Config File)", "归属项(Section)", "配置项(Key)", "说明(Description)", "值(Value)"])
-        self.wc_show_world_setting.horizontalHeader().setStretchLastSection(True)
+        # 设置表格模型(Set table model)
+        self._config_model = WorldConfigModel(self)
+        self.wc_show_world_setting.setModel(self._config_model)
 
-        # 设置所有列内容靠左对齐(Set all columns left-aligned)
-        for col in range(self.wc_show_world_setting.columnCount()):
-            self.wc_show_world_setting.horizontalHeader().setSectionResizeMode(col, QHeaderView.Stretch)
-            self.wc_show_world_setting.horizontalHeaderItem(col).setTextAlignment(Qt.AlignLeft)
+        # 所有列等宽拉伸，表头靠左对齐(Stretch all columns, left-aligned header)
+        header = self.wc_show_world_setting.horizontalHeader()
+        header.setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        header.setStretchLastSection(True)
 
     def __bind_events(self):
         """绑定所有UI控件的事件(Bind all UI control events)"""
 
         # 禁止下拉框的滚轮事件
-        self.wc_choose_config.setFocusPolicy(Qt.StrongFocus)  # 确保只有获得焦点时才能键盘操作
-        self.wc_choose_config.wheelEvent = lambda event: None  # 禁用滚轮事件
+        disable_wheel(self.wc_choose_config)
 
         self.wc_choose_config.currentTextChanged.connect(self.__on_config_changed)
         self.wc_add_new_file.clicked.connect(self.__on_add_new_file)
@@ -78,15 +103,14 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
             return
 
         # 3. 验证文件名合法性
-        if not re.match(r'^[a-zA-Z0-9_\-]+$', new_name):
+        if not _is_valid_config_name(new_name):
             self.message_box(
                 "配置名称只能包含字母、数字、下划线和连字符\n(Config name can only contain letters, numbers, underscores and hyphens)"
             )
             return
 
         # 4. 检查是否已存在
-        new_file_path1 = f"config/game_settings/{new_name}.ini"
-        new_file_path2 = f"config/game_settings/game_ini/{new_name}.ini"
+        new_file_path1, new_file_path2 = _config_file_paths(new_name)
         if os.path.exists(new_file_path1) or os.path.exists(new_file_path2):
             self.message_box(
                 f"配置 {new_name} 已存在!\n(Config {new_name} already exists!)"
@@ -95,26 +119,19 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
 
         # 5. 复制文件
         try:
-            current_file_path1 = f"config/game_settings/{current_config}.ini"
-            current_file_path2 = f"config/game_settings/game_ini/{current_config}.ini"
+            current_file_path1, current_file_path2 = _config_file_paths(current_config)
 
             # 检查并复制GameUserSettings.ini
             if os.path.exists(current_file_path1):
-                with open(current_file_path1, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                with open(new_file_path1, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                shutil.copyfile(current_file_path1, new_file_path1)
 
             # 检查并复制Game.ini
             if os.path.exists(current_file_path2):
-                with open(current_file_path2, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                with open(new_file_path2, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                shutil.copyfile(current_file_path2, new_file_path2)
 
             # 6. 更新下拉框并选中新文件
             self.__load_config_list()
-            index = self.wc_choose_config.findText(new_name)
+            index = self._config_index.get(new_name, -1)
             if index >= 0:
                 self.wc_choose_config.setCurrentIndex(index)
 
@@ -133,105 +150,88 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
 
     def __load_config_list(self):
         """加载所有配置文件列表到下拉框(Load all config files to dropdown)"""
-        self.wc_choose_config.clear()
-        config_dir1 = "config/game_settings"
-        config_dir2 = "config/game_settings/game_ini"
-
+        combo = self.wc_choose_config
         config_names = set()
 
-        # 加载GameUserSettings.ini配置
-        if os.path.exists(config_dir1):
-            for file in os.listdir(config_dir1):
-                if file.endswith(".ini"):
-                    config_names.add(file[:-4])  # 去掉.ini后缀(remove .ini suffix)
+        # 加载GameUserSettings.ini和Game.ini配置
+        for config_dir in (_CONFIG_DIR, _GAME_INI_DIR):
+            # 目录不存在时 scandir 直接抛错，不必先 stat 一次
+            try:
+                it = os.scandir(config_dir)
+            except FileNotFoundError:
+                continue
+            with it:
+                config_names.update(
+                    entry.name[:-4]  # 去掉.ini后缀(remove .ini suffix)
+                    for entry in it if entry.name.endswith(".ini") and entry.is_file(follow_symlinks=False)
+                )
 
-        # 加载Game.ini配置
-        if os.path.exists(config_dir2):
-            for file in os.listdir(config_dir2):
-                if file.endswith(".ini"):
-                    config_names.add(file[:-4])  # 去掉.ini后缀(remove .ini suffix)
+        # 配置名 -> 下拉框索引，查找时不必逐项 findText
+        names = sorted(config_names)
+        self._config_index = {name: index for index, name in enumerate(names)}
 
-        # 添加到下拉框
-        for name in sorted(config_names):
-            self.wc_choose_config.addItem(name)
+        # 填充期间屏蔽信号，避免每次选中项变化都重建表格
+        with QSignalBlocker(combo):
+            combo.clear()
+            # 一次性添加到下拉框
+            combo.addItems(names)
 
-        # 设置当前选中项(Set current selection)
-        index = self.wc_choose_config.findText(self.current_config)
-        if index >= 0:
-            self.wc_choose_config.setCurrentIndex(index)
+            # 设置当前选中项(Set current selection)
+            index = self._config_index.get(self.current_config, -1)
+            if index >= 0:
+                combo.setCurrentIndex(index)
+
+        # 原配置已不存在时切换到下拉框当前项
+        if combo.currentText() != self.current_config:
+            self.__on_config_changed(combo.currentText())
 
     def __load_config_data(self):
         """加载当前选中的配置文件数据到表格(Load selected config data to table)"""
-        # 先清空表格
-        self.wc_show_world_setting.setRowCount(0)
-
-        # 加载GameUserSettings.ini数据
-        self.__load_single_config_data(ins_game_setting, "GameUserSettings.ini")
-
-        # 加载Game.ini数据
-        self.__load_single_config_data(ins_game_ini_setting, "Game.ini")
-
-    def __load_single_config_data(self, config_instance, config_file_name):
-        """加载单个配置文件的数据到表格(Load single config data to table)"""
-        # 获取全部section
-        all_section = config_instance.get_all_section()
-        for section_name in all_section:
-            if "_ARKToolTip" in section_name:
-                continue
-            # 获取ServerSettings和Tip数据(Get ServerSettings and Tip data)
-            server_settings = config_instance.get_section(section_name)
-            tips = config_instance.get_section(f"{section_name}_ARKToolTip")
-
+        # 先收集两个配置文件的全部行，再与当前模型数据比较后差量更新
+        rows = self.__collect_config_rows(ins_game_setting, "GameUserSettings.ini")  # GameUserSettings.ini数据
+        rows += self.__collect_config_rows(ins_game_ini_setting, "Game.ini")  # Game.ini数据
+        self._config_model.update_rows(rows)
+
+    @staticmethod
+    def __collect_config_rows(config_instance, config_file_name):
+        """收集单个配置文件要显示的行(Collect rows of single config)"""
+        rows = []
+        extend = rows.extend
+        # 一次取出全部section及其Tip数据(Get all sections with tips)
+        for section_name, (server_settings, tips) in config_instance.get_sections_with_tips().items():
             # 如果ServerSettings为空，则不显示任何内容
             if not server_settings:
                 continue
 
-            # 确保Tip部分存在且与ServerSettings键一致
-            if not tips:
-                tips = {key: f"请添加{key}的说明(Please add description for {key})"
-                        for key in server_settings.keys()}
-
-            # 填充表格(Populate table)
-            for key, value in server_settings.items():
-                row_position = self.wc_show_world_setting.rowCount()
-                self.wc_show_world_setting.insertRow(row_position)
-
-                # 配置文件(Config File)
-                config_item = QTableWidgetItem(config_file_name)
-                config_item.setTextAlignment(Qt.AlignLeft)
-                self.wc_show_world_setting.setItem(row_position, 0, config_item)
-
-                # 归属项(Section)
-                section_item = QTableWidgetItem(section_name)
-                section_item.setTextAlignment(Qt.AlignLeft)
-                self.wc_show_world_setting.setItem(row_position, 1, section_item)
-
-                # 配置项(Key)
-                key_item = QTableWidgetItem(key)
-                key_item.setTextAlignment(Qt.AlignLeft)
-                self.wc_show_world_setting.setItem(row_position, 2, key_item)
-
-                # 说明(Description)
-                tip_item = QTableWidgetItem(tips.get(key, ""))
-                tip_item.setTextAlignment(Qt.AlignLeft)
-                self.wc_show_world_setting.setItem(row_position, 3, tip_item)
-
-                # 值(Value)
-                value_item = QTableWidgetItem(value)
-                value_item.setTextAlignment(Qt.AlignLeft)
-                self.wc_show_world_setting.setItem(row_position, 4, value_item)
+            # 配置文件、归属项、配置项、说明、值；没有Tip部分时说明为None，由模型显示默认说明
+            if tips:
+                get_tip = tips.get  # 逐行调用的方法先绑定为局部变量
+                extend([config_file_name, section_name, key, get_tip(key, ""), value]
+                       for key, value in server_settings.items())
+            else:
+                extend([config_file_name, section_name, key, None, value]
+                       for key, value in server_settings.items())
+        return rows
 
     def __on_config_changed(self, config_name):
-        """当下拉框选择改变时(When dropdown selection changes)"""
+        """当下拉框选择改变时(When dropdown selection changes)
+
+        连续多次切换只在事件循环空闲时重建一次表格。
+        """
         if config_name:
             self.current_config = config_name
-            # 切换配置文件路径
-            ins_game_setting.change_config_path(config_name)
-            ins_game_ini_setting.change_config_path(config_name)
-            # 重置表格
-            self.wc_show_world_setting.setRowCount(0)
-            # 重新加载数据
-            self.__load_config_data()
+            if not self._reload_pending:
+                self._reload_pending = True
+                QTimer.singleShot(0, self.__reload_current_config)
+
+    def __reload_current_config(self):
+        """切换到 current_config 并重新加载表格(Switch to current_config and reload table)"""
+        self._reload_pending = False
+        # 切换配置文件路径
+        ins_game_setting.change_config_path(self.current_config)
+        ins_game_ini_setting.change_config_path(self.current_config)
+        # 重新加载数据
+        self.__load_config_data()
 
     def __on_add_new_file(self):
         """添加新配置文件(Add new config file)"""
@@ -243,15 +243,14 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
 
         if ok and new_name:
             # 验证文件名合法性(Validate filename)
-            if not re.match(r'^[a-zA-Z0-9_\-]+$', new_name):
+            if not _is_valid_config_name(new_name):
                 self.message_box(
                     "配置名称只能包含字母、数字、下划线和连字符\n(Config name can only contain letters, numbers, underscores and hyphens)"
                 )
                 return
 
             # 检查是否已存在(Check if already exists)
-            file_path1 = f"config/game_settings/{new_name}.ini"
-            file_path2 = f"config/game_settings/game_ini/{new_name}.ini"
+            file_path1, file_path2 = _config_file_paths(new_name)
             if os.path.exists(file_path1) or os.path.exists(file_path2):
                 self.message_box(
                     f"配置 {new_name} 已存在!\n(Config {new_name} already exists!)"
@@ -261,18 +260,16 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
             # 创建空文件(Create empty file)
             try:
                 # 创建GameUserSettings.ini
-                os.makedirs("config/game_settings", exist_ok=True)
-                with open(file_path1, 'w') as f:
-                    f.write("[ServerSettings]\n[ServerSettings_ARKToolTip]\n")
+                with open(file_path1, 'w', encoding='utf-8') as f:
+                    f.write(_EMPTY_CONFIG)
 
                 # 创建Game.ini
-                os.makedirs("config/game_settings/game_ini", exist_ok=True)
-                with open(file_path2, 'w') as f:
-                    f.write("[ServerSettings]\n[ServerSettings_ARKToolTip]\n")
+                with open(file_path2, 'w', encoding='utf-8') as f:
+                    f.write(_EMPTY_CONFIG)
 
                 # 更新下拉框并选中新文件(Update dropdown and select new file)
                 self.__load_config_list()
-                index = self.wc_choose_config.findText(new_name)
+                index = self._config_index.get(new_name, -1)
                 if index >= 0:
                     self.wc_choose_config.setCurrentIndex(index)
 
@@ -291,42 +288,32 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
     def __on_save_changes(self):
         """保存表格中的修改到当前配置文件(Save table changes to current config)"""
         try:
-            game_user_settings = {}
-            game_ini_settings = {}
-            game_user_tips = {}
-            game_ini_tips = {}
+            # 每个配置文件对应 (配置项, 说明)，均按 section 分组
+            grouped = {
+                "GameUserSettings.ini": (defaultdict(dict), defaultdict(dict)),
+                "Game.ini": (defaultdict(dict), defaultdict(dict)),
+            }
 
             # 收集表格中的数据(Collect data from table)
-            for row in range(self.wc_show_world_setting.rowCount()):
-                config_file = self.wc_show_world_setting.item(row, 0).text()
-                section = self.wc_show_world_setting.item(row, 1).text()
-                key = self.wc_show_world_setting.item(row, 2).text()
-                tip = self.wc_show_world_setting.item(row, 3).text()
-                value = self.wc_show_world_setting.item(row, 4).text()
-
-                if config_file == "GameUserSettings.ini":
-                    game_user_settings.setdefault(section, {})
-                    game_user_tips.setdefault(f"{section}_ARKToolTip", {})
-                    game_user_settings[section][key] = value
-                    game_user_tips[f"{section}_ARKToolTip"][key] = tip
-                elif config_file == "Game.ini":
-                    game_ini_settings.setdefault(section, {})
-                    game_ini_tips.setdefault(f"{section}_ARKToolTip", {})
-                    game_ini_settings[section][key] = value
-                    game_ini_tips[f"{section}_ARKToolTip"][key] = tip
-                else:
+            for config_file, section, key, tip, value in self._config_model.rows():
+                target = grouped.get(config_file)
+                if target is None:
                     self.message_box("只能编辑GameUserSettings.ini或Game.ini文件，请检查你的第一列。(You can only edit the GameUserSettings.ini or Game.ini files. Please check your first column.)")
                     return
-
-            # 更新GameUserSettings.ini
-            for section in game_user_settings.keys():
-                ins_game_setting.update_section(section, game_user_settings[section])
-                ins_game_setting.update_section(f"{section}_ARKToolTip", game_user_tips[f"{section}_ARKToolTip"])
-
-            # 更新Game.ini
-            for section in game_ini_settings.keys():
-                ins_game_ini_setting.update_section(section, game_ini_settings[section])
-                ins_game_ini_setting.update_section(f"{section}_ARKToolTip", game_ini_tips[f"{section}_ARKToolTip"])
+                settings, tips = target
+                settings[section][key] = value
+                tips[section][key] = tip if tip is not None else default_tip(key)
+
+            # 更新GameUserSettings.ini和Game.ini，每个文件一次批量更新、一次写盘
+            for config_instance, config_file in ((ins_game_setting, "GameUserSettings.ini"),
+                                                 (ins_game_ini_setting, "Game.ini")):
+                settings, tips = grouped[config_file]
+                sections = {}
+                for section, items in settings.items():
+                    sections[section] = items
+                    sections[f"{section}_ARKToolTip"] = tips[section]
+                config_instance.update_sections(sections)
+                config_instance.flush()
 
             self.message_box(
                 "配置已保存!\n(Config saved successfully!)"
@@ -339,33 +326,7 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
 
     def __on_add_row(self):
         """添加新行(Add new row)"""
-        row_position = self.wc_show_world_setting.rowCount()
-        self.wc_show_world_setting.insertRow(row_position)
-
-        # 配置文件(Config File)
-        config_item = QTableWidgetItem("GameUserSettings.ini")
-        config_item.setTextAlignment(Qt.AlignLeft)
-        self.wc_show_world_setting.setItem(row_position, 0, config_item)
-
-        # 归属项(Section)
-        section_item = QTableWidgetItem("")
-        section_item.setTextAlignment(Qt.AlignLeft)
-        self.wc_show_world_setting.setItem(row_position, 1, section_item)
-
-        # 配置项(Key)
-        key_item = QTableWidgetItem("")
-        key_item.setTextAlignment(Qt.AlignLeft)
-        self.wc_show_world_setting.setItem(row_position, 2, key_item)
-
-        # 说明(Description)
-        tip_item = QTableWidgetItem("")
-        tip_item.setTextAlignment(Qt.AlignLeft)
-        self.wc_show_world_setting.setItem(row_position, 3, tip_item)
-
-        # 值(Value)
-        value_item = QTableWidgetItem("")
-        value_item.setTextAlignment(Qt.AlignLeft)
-        self.wc_show_world_setting.setItem(row_position, 4, value_item)
+        self._config_model.append_row(["GameUserSettings.ini", "", "", "", ""])
 
         # 滚动到最后一行(Scroll to bottom)
         self.wc_show_world_setting.scrollToBottom()
@@ -388,9 +349,7 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
 
         row = selected_rows[0].row()
         # 获取配置文件和section、key
-        config_file = self.wc_show_world_setting.item(row, 0).text()
-        section = self.wc_show_world_setting.item(row, 1).text()
-        key = self.wc_show_world_setting.item(row, 2).text()
+        config_file, section, key = self._config_model.rows()[row][:3]
         tip_section = f"{section}_ARKToolTip"
 
         # 根据配置文件类型删除
@@ -401,4 +360,4 @@ class MainPage_WorldConfigSet(BasePage, Ui_MainPage):
             ins_game_ini_setting.delete(section, key)
             ins_game_ini_setting.delete(tip_section, key)
 
-        self.wc_show_world_setting.removeRow(row)
\ No newline at end of file
+        self._config_model.remove_row(row)
\ No newline at end of file
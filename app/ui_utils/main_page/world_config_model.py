@@ -0,0 +1,117 @@
+from typing import List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+# 列顺序与表头一致：配置文件、归属项、配置项、说明、值
+CONFIG_HEADERS = ("配置文件(Config File)", "归属项(Section)", "配置项(Key)", "说明(Description)", "值(Value)")
+COL_FILE = 0
+COL_SECTION = 1
+COL_KEY = 2
+COL_TIP = 3
+COL_VALUE = 4
+
+# 所有单元格共用的对齐方式和标志
+_ALIGN = Qt.AlignLeft | Qt.AlignVCenter
+_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+_DEFAULT_TIP = "请添加{0}的说明(Please add description for {0})"
+
+
+def default_tip(key: str) -> str:
+    """缺少说明节时显示的默认说明"""
+    return _DEFAULT_TIP.format(key)
+
+
+class WorldConfigModel(QAbstractTableModel):
+    """世界配置表格数据模型，每行一个长度为5的字符串列表
+
+    说明列为 None 表示该配置节没有说明，显示时才生成默认说明。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[List[str]] = []
+
+    def rows(self) -> List[List[Optional[str]]]:
+        return self._rows
+
+    def set_rows(self, rows: List[List[str]]) -> None:
+        """整体替换数据"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def update_rows(self, rows: List[List[str]]) -> None:
+        """差量替换数据：只通知内容变化的行，行数变化时只在末尾插入/删除，不重置整个视图"""
+        old_rows = self._rows
+        common = min(len(old_rows), len(rows))
+
+        if len(old_rows) > common:
+            self.beginRemoveRows(QModelIndex(), common, len(old_rows) - 1)
+            del old_rows[common:]
+            self.endRemoveRows()
+
+        changed = [row for row in range(common) if old_rows[row] != rows[row]]
+        old_rows[:common] = rows[:common]
+        if changed:
+            self.dataChanged.emit(
+                self.index(changed[0], 0),
+                self.index(changed[-1], len(CONFIG_HEADERS) - 1),
+            )
+
+        if len(rows) > common:
+            self.beginInsertRows(QModelIndex(), common, len(rows) - 1)
+            old_rows.extend(rows[common:])
+            self.endInsertRows()
+
+    def append_row(self, row_data: List[str]) -> int:
+        """追加一行，返回行号"""
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(row_data)
+        self.endInsertRows()
+        return row
+
+    def remove_row(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(CONFIG_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return CONFIG_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            row_data = self._rows[index.row()]
+            value = row_data[index.column()]
+            if value is None:
+                return default_tip(row_data[COL_KEY])
+            return value
+        if role == Qt.TextAlignmentRole:
+            return _ALIGN
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row_data = self._rows[index.row()]
+        column = index.column()
+        if row_data[column] == value:
+            return True
+        row_data[column] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return _FLAGS
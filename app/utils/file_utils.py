@@ -0,0 +1,20 @@
+import os
+import tempfile
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """原子写入文件：一次写入同目录下的临时文件并fsync，再用 os.replace 替换目标文件"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # 写入失败时删除临时文件，目标文件保持原样
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,45 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog为可选依赖，未安装时由调用方回退到定时轮询
+    Observer = None
+
+if Observer is not None:
+    class _SetEventHandler(FileSystemEventHandler):
+        """文件系统事件满足条件时 set 给定的 threading.Event"""
+
+        def __init__(self, ready: threading.Event, match: Callable):
+            super().__init__()
+            self._ready = ready
+            self._match = match
+
+        def on_any_event(self, event):
+            if self._match(event):
+                self._ready.set()
+
+
+@contextmanager
+def watch_directory(path: str, ready: threading.Event, match: Callable,
+                    recursive: bool = False) -> Iterator[bool]:
+    """
+    监视目录，事件满足 match(event) 时 set ready
+    :return: 是否已开启监视；watchdog未安装或监视失败时为False，调用方需自行轮询
+    """
+    observer = None
+    if Observer is not None:
+        observer = Observer()
+        try:
+            observer.schedule(_SetEventHandler(ready, match), path, recursive=recursive)
+            observer.start()
+        except OSError:
+            observer = None
+    try:
+        yield observer is not None
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
@@ -1,45 +1,161 @@
 import configparser
+import functools
+import io
+import mmap
 import os
+import re
+import sys
+import threading
 import time
 import subprocess
 import psutil
-from typing import Dict, Any, Optional, Tuple
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Dict, Any, Mapping, Optional, Tuple
 from pathlib import Path
 
-from app.models.ini_settings import ins_server_setting, ins_game_setting, ins_game_ini_setting
+from app.models.ini_settings import FastConfigParser, ins_server_setting, ins_game_setting, ins_game_ini_setting
 from app.models.json_setting import ins_mods_setting, ins_world_info
 from app.models.log_data import ins_tool_logger
+from app.utils.file_utils import atomic_write
+from app.utils.fs_watch import watch_directory
+from app.utils import win_job, win_process
+
+
+class _CasePreservingParser(FastConfigParser):
+    """保留键名大小写，键名原样写入启动参数"""
+
+    def optionxform(self, optionstr: str) -> str:
+        return optionstr
+
+
+_WORLD_INI_PARSER = _CasePreservingParser()
+
+
+@functools.lru_cache(maxsize=32)
+def _load_world_settings(file_path: str, mtime_ns: int, size: int) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """解析世界配置的 ServerSettings 段，按 (路径, 修改时间, 大小) 缓存，文件未修改时不重复解析
+
+    没有 ServerSettings 段时返回 None。
+    """
+    # 世界配置由本工具按简单 key = value 格式保存，用轻量解析器即可
+    section = _WORLD_INI_PARSER.read(file_path).get('ServerSettings')
+    return tuple(section.items()) if section is not None else None
+
+
+# 服务器进程（包括临时服务器）的启动方式：完全独立且不显示控制台窗口
+# Popen 会复制传入的 STARTUPINFO，同一个对象可以重复使用
+if sys.platform == "win32":
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+    _CREATION_FLAGS = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS | subprocess.CREATE_NO_WINDOW
+else:
+    _STARTUPINFO = None
+    _CREATION_FLAGS = 0
+
+# 服务器日志中的就绪/错误标志，编译为一个正则，一次扫描同时匹配全部标志
+_READY_PATTERNS = (
+    "Server has completed startup and is now advertising for join",
+    "Server has completed",
+    "Server is ready",
+    "is now advertising for join",
+)
+_ERROR_PATTERNS = (
+    "Error querying server mods: ApiError: Failed (serverUnreachable)",
+    "Error querying server mods",
+    "Failed (serverUnreachable)",
+    # 可以添加其他需要监控的错误模式
+)
+# 直接在映射的日志字节上匹配，无需解码为字符串
+_LOG_PATTERN_RE = re.compile("(?P<ready>{0})|(?P<error>{1})".format(
+    "|".join(map(re.escape, _READY_PATTERNS)), "|".join(map(re.escape, _ERROR_PATTERNS))).encode('utf-8'))
+# 每次从上次扫描位置之前这么多字节开始匹配，避免标志被两次写入截断
+_LOG_PATTERN_TAIL = max(len(p.encode('utf-8')) for p in _READY_PATTERNS + _ERROR_PATTERNS) - 1
+
+
+@dataclass(frozen=True)
+class _ServerSnap:
+    """一次启动过程中不会变化的服务器设置，启动时读取一次"""
+    __slots__ = ("root_path", "max_player", "server_pwd", "admin_pwd", "be_open", "more_worlds_open",
+                 "cluster_id", "cluster_path", "mods_open")
+    root_path: str
+    max_player: int
+    server_pwd: str
+    admin_pwd: str
+    be_open: bool
+    more_worlds_open: bool
+    cluster_id: str
+    cluster_path: str
+    mods_open: bool
+
+    @classmethod
+    def capture(cls) -> "_ServerSnap":
+        return cls(
+            root_path=ins_server_setting.root_path,
+            max_player=ins_server_setting.max_player,
+            server_pwd=ins_server_setting.server_pwd,
+            admin_pwd=ins_server_setting.admin_pwd,
+            be_open=ins_server_setting.be_open,
+            more_worlds_open=ins_server_setting.more_worlds_open,
+            cluster_id=ins_server_setting.cluster_id,
+            cluster_path=ins_server_setting.cluster_path,
+            mods_open=ins_server_setting.mods_open,
+        )
+
+
+@dataclass(frozen=True)
+class _CommandParts:
+    """各世界启动命令中相同的部分，每次启动只计算一次"""
+    __slots__ = ("quoted_exe", "extra_params", "mods_params")
+    quoted_exe: str
+    extra_params: str
+    mods_params: str
 
 
 class OpenServer:
     _processes = {}  # 保存所有服务器进程
     _max_retry_attempts = 10  # 最大重试次数
     _temp_process = None  # 保存临时服务器进程
+    _temp_job = None  # 临时服务器所在的作业对象句柄
+    _temp_waiter = None  # 已有后台线程等待其退出的临时服务器进程
+    _temp_exit_event = None  # 临时服务器退出时要 set 的事件（当前等待步骤的 ready）
     _server_ready_timeout = 600  # 服务器就绪超时时间(秒)
+    _watch_check_interval = 30  # 监视目录时检查临时服务器是否退出的间隔(秒)
 
     @classmethod
     def start(cls):
         """启动所有配置开启的世界服务器（带自动配置和模组检查）"""
-        server_exe = cls._get_server_executable()
+        # 服务器设置在本次启动中保持不变，只读取一次
+        snap = _ServerSnap.capture()
+        server_exe = cls._get_server_executable(snap.root_path)
         if not os.path.exists(server_exe):
             cls._log(f"{server_exe} 不存在(does not exist)", error=True)
             return
 
+        parts = _CommandParts(
+            quoted_exe=f'"{server_exe}"',
+            extra_params=cls._get_extra_params(snap),
+            mods_params=cls._get_mods_params(snap),
+        )
+        # 世界列表及第一个开启的世界（临时服务器使用）也只取一次
+        all_worlds = ins_world_info.get_all()
+        first_open = next(((k, v) for k, v in all_worlds.items() if v["open"]), (None, None))
         try:
             # 第一步：检查并生成GameUserSettings.ini文件
-            if not cls._ensure_game_user_settings():
+            if not cls._ensure_game_user_settings(snap, parts, all_worlds, first_open):
                 return
 
-            # 第二步：检查所有模组是否已下载
-            if not cls._ensure_all_mods_downloaded():
+            # 第二步：检查所有模组是否已下载（复用第一步仍在运行的临时服务器）
+            if not cls._ensure_all_mods_downloaded(snap, parts, all_worlds, first_open):
                 return
-
-            # 第三步：正常启动所有世界
-            cls._start_all_worlds()
         finally:
-            # 确保临时服务器被关闭
+            # 两步共用同一个临时服务器，都完成后再关闭，并确保启动正式服务器前已关闭
             cls._cleanup_temp_server()
 
+        # 第三步：正常启动所有世界
+        cls._start_all_worlds(snap, parts, all_worlds)
+
     @classmethod
     def _cleanup_temp_server(cls):
         """终极版强制终止临时服务器进程"""
@@ -60,42 +176,30 @@ class OpenServer:
         # except:
         #     pass
 
-        # 方法2: 使用psutil彻底终止进程树
+        # 方法2: 终止临时服务器所在的作业对象，一次调用结束整个进程树
+        job, cls._temp_job = cls._temp_job, None
+        if job is not None:
+            killed = win_job.terminate_job(job)
+            win_job.close_job(job)
+            if killed:
+                cls._log("终止作业对象成功 (PID: %s) (Terminated job object (PID: %s))", pid, pid)
+                cls._temp_process = None
+                return
+
+        # 方法3: 未能使用作业对象时用psutil终止进程树
         try:
-            parent = psutil.Process(pid)
-            for child in parent.children(recursive=True):  # 终止所有子进程
-                try:
-                    child.terminate()
-                except:
-                    try:
-                        child.kill()
-                    except:
-                        pass
-            parent.terminate()
-            parent.wait(timeout=5)
-            cls._log(f"终止进程树成功 (PID: {pid}) (Terminated process tree (PID: {pid}))")
+            cls._kill_process_tree(pid)
+            cls._log("终止进程树成功 (PID: %s) (Terminated process tree (PID: %s))", pid, pid)
             cls._temp_process = None
             return
         except psutil.NoSuchProcess:
-            cls._log(f"进程已不存在 (PID: {pid}) (Process no longer exists (PID: {pid}))")
+            cls._log("进程已不存在 (PID: %s) (Process no longer exists (PID: %s))", pid, pid)
             cls._temp_process = None
             return
         except Exception as e:
             cls._log(f"psutil终止失败: {str(e)} (PID: {pid}) (psutil termination failed: {str(e)} (PID: {pid}))",
                      error=True)
 
-        # 方法3: 使用Windows系统命令强制终止
-        try:
-            subprocess.run(f"taskkill /F /T /PID {pid}", shell=True, check=True)
-            cls._log(f"使用taskkill强制终止成功 (PID: {pid}) (Force killed with taskkill (PID: {pid}))")
-            cls._temp_process = None
-            return
-        except subprocess.CalledProcessError as e:
-            cls._log(f"taskkill终止失败: {str(e)} (PID: {pid}) (taskkill failed: {str(e)} (PID: {pid}))", error=True)
-        except Exception as e:
-            cls._log(f"终止进程时发生意外错误: {str(e)} (PID: {pid}) (Unexpected error: {str(e)} (PID: {pid}))",
-                     error=True)
-
         # 最终确认
         try:
             if cls._temp_process.poll() is None:  # 进程仍在运行
@@ -103,46 +207,123 @@ class OpenServer:
                     f"警告: 可能未能完全终止进程 (PID: {pid}) (Warning: Process may still be running (PID: {pid}))",
                     warning=True)
             else:
-                cls._log(f"进程已终止 (PID: {pid}) (Process terminated (PID: {pid}))")
+                cls._log("进程已终止 (PID: %s) (Process terminated (PID: %s))", pid, pid)
         except:
             cls._log(f"无法确认进程状态 (PID: {pid}) (Unable to verify process status (PID: {pid}))", error=True)
 
         cls._temp_process = None
 
     @classmethod
-    def _ensure_game_user_settings(cls) -> bool:
+    def _kill_process_tree(cls, pid: int) -> None:
+        """先terminate整个进程树，统一等待后kill仍存活的进程；进程不存在时抛出 psutil.NoSuchProcess"""
+        procs = [psutil.Process(pid)]
+        for child_pid in cls._descendants(pid):
+            try:
+                procs.append(psutil.Process(child_pid))
+            except psutil.NoSuchProcess:
+                pass
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
+        _, alive = psutil.wait_procs(procs, timeout=3)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        _, alive = psutil.wait_procs(alive, timeout=3)
+        if alive:
+            raise psutil.TimeoutExpired(3, pid=alive[0].pid)
+
+    @classmethod
+    def _kill_server(cls, world_id: str) -> None:
+        """终止世界服务器进程树，优先使用作业对象"""
+        info = cls._processes[world_id]
+        job = info.get("job")
+        if job is not None:
+            info["job"] = None
+            killed = win_job.terminate_job(job)
+            win_job.close_job(job)
+            if killed:
+                return
+        try:
+            cls._kill_process_tree(info["pid"])
+        except psutil.NoSuchProcess:
+            pass
+
+    @classmethod
+    def _attach_job(cls, proc: subprocess.Popen, kill_on_close: bool = False) -> Optional[int]:
+        """为新启动的进程创建作业对象，返回作业句柄；不可用时返回None"""
+        job = win_job.create_job(kill_on_close)
+        if job is not None and not win_job.assign_process(job, proc._handle):
+            win_job.close_job(job)
+            job = None
+        return job
+
+    @classmethod
+    def _descendants(cls, root_pid: int) -> list:
+        """一次遍历进程表建立 ppid -> pid 映射，再广度优先收集 root_pid 的所有子孙进程PID"""
+        children = defaultdict(list)
+        for proc in psutil.process_iter(['pid', 'ppid']):
+            info = proc.info
+            children[info['ppid']].append(info['pid'])
+
+        result = []
+        seen = {root_pid}
+        queue = deque([root_pid])
+        while queue:
+            for pid in children.get(queue.popleft(), ()):
+                if pid not in seen:  # 防止PID复用造成循环
+                    seen.add(pid)
+                    result.append(pid)
+                    queue.append(pid)
+        return result
+
+    @classmethod
+    def _ensure_game_user_settings(cls, snap: _ServerSnap, parts: _CommandParts,
+                                   all_worlds: Mapping[str, Any], first_open: Tuple) -> bool:
         """确保GameUserSettings.ini文件存在"""
-        settings_file = cls._get_server_settings_file()
+        settings_file = cls._get_server_settings_file(snap.root_path)
         if os.path.exists(settings_file):
             return True
 
         cls._log(
             "GameUserSettings.ini不存在，将启动临时服务器生成该文件... (GameUserSettings.ini not found, starting temporary server to generate it...)")
 
-        all_worlds = ins_world_info.get_all()
         if not all_worlds:
             cls._log("没有可用的世界配置 (No world configurations available)", error=True)
             return False
 
-        # 获取第一个开启的世界
-        first_world_id, first_world_data = next(((k, v) for k, v in all_worlds.items() if v["open"]), (None, None))
+        first_world_id, first_world_data = first_open
         if not first_world_id:
             cls._log("没有开启的世界 (No enabled worlds)", error=True)
             return False
 
-        # 启动临时服务器
-        server_exe = cls._get_server_executable()
-        command = cls._build_server_command(first_world_id, first_world_data, server_exe)
-        cls._temp_process = cls._launch_temp_server(first_world_id, command)
-
-        # 等待文件生成
+        # 等待文件生成：监视配置目录，文件出现或临时服务器退出时立即唤醒；未能监视时每5秒轮询一次
         max_wait_time = 300  # 5分钟超时
-        start_time = time.time()
-        result = False
+        settings_dir = os.path.dirname(settings_file)
+        os.makedirs(settings_dir, exist_ok=True)
+        target = os.path.normcase(settings_file)
+        ready = threading.Event()
+
+        # 启动临时服务器，由 start() 在模组检查完成后统一关闭
+        command = cls._build_server_command(first_world_id, first_world_data, snap, parts)
+        cls._wake_on_exit(cls._ensure_temp_server(first_world_id, command), ready)
+
+        with watch_directory(
+                settings_dir, ready,
+                lambda e: os.path.normcase(getattr(e, "dest_path", "") or e.src_path) == target) as watching:
+            check_interval = cls._watch_check_interval if watching else 5
+            start_time = time.monotonic()
+            while True:
+                # 先清除事件再检查，检查之后的变化会在下一次等待时立即唤醒
+                ready.clear()
+                if os.path.exists(settings_file):
+                    break
 
-        try:
-            while not os.path.exists(settings_file):
-                if time.time() - start_time > max_wait_time:
+                if time.monotonic() - start_time > max_wait_time:
                     cls._log(
                         "等待GameUserSettings.ini生成超时 (Timeout waiting for GameUserSettings.ini to be generated)",
                         error=True)
@@ -152,40 +333,67 @@ class OpenServer:
                 if cls._temp_process.poll() is not None:
                     cls._log("临时服务器意外退出，正在重新启动... (Temporary server crashed, restarting...)",
                              warning=True)
-                    cls._temp_process = cls._launch_temp_server(first_world_id, command)
-                    start_time = time.time()  # 重置超时计时器
+                    cls._wake_on_exit(cls._ensure_temp_server(first_world_id, command), ready)
+                    start_time = time.monotonic()  # 重置超时计时器
 
-                time.sleep(5)
+                ready.wait(check_interval)
 
-            cls._log("GameUserSettings.ini已成功生成 (GameUserSettings.ini has been successfully generated)")
-            result = True
-        finally:
-            # 无论成功与否都关闭临时服务器
-            cls._cleanup_temp_server()
+        cls._log("GameUserSettings.ini已成功生成 (GameUserSettings.ini has been successfully generated)")
+        return True
 
-        return result
+    @classmethod
+    def _ensure_temp_server(cls, world_id: str, command: str) -> subprocess.Popen:
+        """临时服务器未运行时启动它，上一步启动的临时服务器仍在运行时直接复用"""
+        if cls._temp_process is None or cls._temp_process.poll() is not None:
+            cls._temp_process = cls._launch_temp_server(world_id, command)
+        return cls._temp_process
+
+    @classmethod
+    def _wake_on_exit(cls, proc: subprocess.Popen, ready: threading.Event) -> None:
+        """
+        进程退出时 set ready，进程崩溃时等待立即结束，不必等到下一次检查
+        每个进程只启动一个等待线程，复用同一进程时只更换要 set 的事件
+        """
+        cls._temp_exit_event = ready
+        if cls._temp_waiter is proc:
+            return
+        cls._temp_waiter = proc
+
+        def wait():
+            proc.wait()
+            event = cls._temp_exit_event
+            if event is not None:
+                event.set()
+
+        threading.Thread(target=wait, daemon=True).start()
 
     @classmethod
     def _launch_temp_server(cls, world_id: str, command: str) -> subprocess.Popen:
         """启动临时服务器用于生成配置文件"""
-        cls._log(f"启动临时服务器 {world_id} (Starting temporary server {world_id})")
+        cls._log("启动临时服务器 %s (Starting temporary server %s)", world_id, world_id)
         try:
+            # 不经过 cmd.exe，命令行字符串原样交给 CreateProcess
             proc = subprocess.Popen(
                 command,
-                shell=True,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS,
+                creationflags=_CREATION_FLAGS,
+                startupinfo=_STARTUPINFO,
                 close_fds=True
             )
             cls._processes[world_id] = proc
+            # 临时服务器随作业句柄关闭一起终止，崩溃重启时顺带清理上一次残留的子进程
+            if cls._temp_job is not None:
+                win_job.close_job(cls._temp_job)
+            cls._temp_job = cls._attach_job(proc, kill_on_close=True)
             return proc
         except Exception as e:
             cls._log(f"启动临时服务器失败: {str(e)} (Failed to start temporary server: {str(e)})", error=True)
             raise
 
     @classmethod
-    def _ensure_all_mods_downloaded(cls) -> bool:
+    def _ensure_all_mods_downloaded(cls, snap: _ServerSnap, parts: _CommandParts,
+                                    all_worlds: Mapping[str, Any], first_open: Tuple) -> bool:
         """确保所有启用的模组已下载"""
-        if not ins_server_setting.mods_open:
+        if not snap.mods_open:
             return True
 
         enabled_mods = {mod_id for mod_id, mod_data in ins_mods_setting.get_all().items() if mod_data["open"]}
@@ -195,115 +403,139 @@ class OpenServer:
         cls._log(f"需要检查的模组: {enabled_mods} (Mods to check: {enabled_mods})")
 
         # 检查是否所有模组都已下载
-        mods_path = cls._get_mods_directory()
-        if mods_path and cls._check_all_mods_downloaded(mods_path, enabled_mods):
+        missing = cls._check_missing_mods(cls._get_mods_directory(snap.root_path), enabled_mods)
+        if not missing:
             return True
 
         cls._log(
             "模组目录不存在或模组未下载，将启动临时服务器下载模组... (Mods directory not found or mods not downloaded, starting temporary server to download mods...)")
 
-        all_worlds = ins_world_info.get_all()
         if not all_worlds:
             cls._log("没有可用的世界配置 (No world configurations available)", error=True)
             return False
 
-        # 获取第一个开启的世界
-        first_world_id, first_world_data = next(((k, v) for k, v in all_worlds.items() if v["open"]), (None, None))
+        first_world_id, first_world_data = first_open
         if not first_world_id:
             cls._log("没有开启的世界 (No enabled worlds)", error=True)
             return False
 
-        # 启动临时服务器下载模组
-        server_exe = cls._get_server_executable()
-        command = cls._build_server_command(first_world_id, first_world_data, server_exe)
+        # 启动（或复用）临时服务器下载模组，由 start() 统一关闭
+        command = cls._build_server_command(first_world_id, first_world_data, snap, parts)
 
         attempt = 0
         result = False
-
-        try:
+        # 监视模组根目录，有新目录创建或临时服务器退出时才重新检查；未能监视时每10秒轮询一次
+        mods_root = cls._get_mods_root(snap.root_path)
+        os.makedirs(mods_root, exist_ok=True)
+        ready = threading.Event()
+
+        with watch_directory(str(mods_root), ready,
+                             lambda e: e.is_directory and e.event_type == "created",
+                             recursive=True) as watching:
+            base_interval = cls._watch_check_interval if watching else 10
             while attempt < cls._max_retry_attempts:
                 attempt += 1
-                cls._log(f"尝试下载模组 (第 {attempt} 次) (Attempting to download mods (attempt {attempt}))")
+                cls._log("尝试下载模组 (第 %s 次) (Attempting to download mods (attempt %s))", attempt, attempt)
 
-                cls._temp_process = cls._launch_temp_server(first_world_id, command)
-                start_time = time.time()
+                cls._wake_on_exit(cls._ensure_temp_server(first_world_id, command), ready)
+                start_time = time.monotonic()
                 max_wait_time = 600  # 10分钟超时
-
-                while time.time() - start_time < max_wait_time:
-                    # 检查模组目录是否存在
-                    mods_path = cls._get_mods_directory()
-                    if mods_path and cls._check_all_mods_downloaded(mods_path, enabled_mods):
+                check_interval = base_interval
+                prev_missing = None
+
+                while time.monotonic() - start_time < max_wait_time:
+                    # 先清除事件再检查，检查期间创建的目录会在下一次等待时立即唤醒
+                    ready.clear()
+                    missing = cls._check_missing_mods(cls._get_mods_directory(snap.root_path), enabled_mods)
+                    if not missing:
                         cls._log("所有模组已成功下载 (All mods have been successfully downloaded)")
                         result = True
                         break
 
+                    # 缺少的模组没有变化时逐步延长检查间隔（最长60秒），有进展时恢复
+                    if missing == prev_missing:
+                        check_interval = min(check_interval * 2, max(base_interval, 60))
+                    else:
+                        check_interval = base_interval
+                        cls._log("尚未下载的模组: %s (Mods not yet downloaded: %s)",
+                                 sorted(missing), sorted(missing))
+                    prev_missing = missing
+
                     # 检查进程是否仍在运行
                     if cls._temp_process.poll() is not None:
                         cls._log("服务器意外退出，正在重新启动... (Server crashed, restarting...)", warning=True)
-                        cls._temp_process = cls._launch_temp_server(first_world_id, command)
-                        start_time = time.time()  # 重置超时计时器
+                        cls._wake_on_exit(cls._ensure_temp_server(first_world_id, command), ready)
+                        start_time = time.monotonic()  # 重置超时计时器
 
-                    time.sleep(10)
+                    ready.wait(check_interval)
 
                 if result:
                     break
 
                 cls._cleanup_temp_server()
 
-            if not result:
-                cls._log(
-                    f"下载模组失败，已达到最大重试次数 {cls._max_retry_attempts} (Failed to download mods, reached max retry attempts {cls._max_retry_attempts})",
-                    error=True)
-        finally:
-            # 无论成功与否都关闭临时服务器
-            cls._cleanup_temp_server()
+        if not result:
+            cls._log(
+                f"下载模组失败，已达到最大重试次数 {cls._max_retry_attempts} (Failed to download mods, reached max retry attempts {cls._max_retry_attempts})",
+                error=True)
 
         return result
 
     @classmethod
-    def _get_mods_directory(cls) -> Path:
-        """获取模组目录路径，如果不存在则返回None"""
-        mods_root = Path(ins_server_setting.root_path) / "ShooterGame" / "Binaries" / "Win64" / "ShooterGame" / "Mods"
-        if not mods_root.exists():
-            return None
+    def _get_mods_root(cls, root_path: str) -> Path:
+        """获取模组根目录路径"""
+        return Path(root_path) / "ShooterGame" / "Binaries" / "Win64" / "ShooterGame" / "Mods"
 
-        # 查找第一个子目录（通常是Steam Workshop ID）
-        workshop_dirs = list(mods_root.iterdir())
-        if not workshop_dirs:
+    @classmethod
+    def _get_mods_directory(cls, root_path: str) -> Optional[Path]:
+        """获取模组目录路径，如果不存在则返回None"""
+        # 查找第一个子目录（通常是Steam Workshop ID），取到第一项即停止遍历
+        try:
+            with os.scandir(cls._get_mods_root(root_path)) as it:
+                first = next(it, None)
+        except FileNotFoundError:
             return None
-
-        return workshop_dirs[0]
+        return Path(first.path) if first is not None else None
 
     @classmethod
-    def _check_all_mods_downloaded(cls, mods_path: Path, required_mods: set) -> bool:
-        """检查所有需要的模组是否已下载"""
-        if not mods_path or not mods_path.exists():
-            return False
+    def _check_missing_mods(cls, mods_path: Optional[Path], required_mods: set) -> set:
+        """返回尚未下载的模组ID集合，全部已下载时为空集合"""
+        if not mods_path:
+            return set(required_mods)
 
-        downloaded_mods = set()
-        for mod_dir in mods_path.iterdir():
-            if mod_dir.is_dir() and "_" in mod_dir.name:
-                mod_id = mod_dir.name.split("_")[0]
-                downloaded_mods.add(mod_id)
+        # DirEntry.is_dir 在Windows上直接使用目录项中的信息，无需额外stat
+        try:
+            with os.scandir(mods_path) as it:
+                downloaded_mods = {
+                    entry.name.split("_", 1)[0] for entry in it
+                    if "_" in entry.name and entry.is_dir(follow_symlinks=False)
+                }
+        except (FileNotFoundError, NotADirectoryError):
+            return set(required_mods)
 
-        return required_mods.issubset(downloaded_mods)
+        return required_mods - downloaded_mods
 
     @classmethod
-    def _start_all_worlds(cls):
+    def _start_all_worlds(cls, snap: _ServerSnap, parts: _CommandParts, all_worlds: Mapping[str, Any]):
         """启动所有配置开启的世界服务器"""
-        server_exe = cls._get_server_executable()
-        all_worlds = ins_world_info.get_all()
+        # 共用同一世界配置的世界只解析一次
+        world_params_cache = {}
+        # 各世界共用同一份 GameUserSettings.ini/Game.ini，启动前写入一次
+        cls._write_game_user_settings(snap.root_path)
 
         for world_id, world_data in all_worlds.items():
             if not world_data["open"]:
                 continue
 
             cls._log_server_startup(world_id, world_data)
-            command = cls._build_server_command(world_id, world_data, server_exe)
-            cls._write_game_user_settings()
+            world_set = world_data["world_set"]
+            world_params = world_params_cache.get(world_set)
+            if world_params is None:
+                world_params = world_params_cache[world_set] = cls._get_world_config(world_set)
+            command = cls._build_server_command(world_id, world_data, snap, parts, world_params)
 
             # 启动并监控服务器
-            success = cls._launch_and_monitor_server(world_id, command)
+            success = cls._launch_and_monitor_server(world_id, command, snap.root_path)
             if not success:
                 cls._log(
                     f"服务器 {world_id} 启动失败，跳过后续世界 (Server {world_id} failed to start, skipping subsequent worlds)",
@@ -313,24 +545,12 @@ class OpenServer:
         cls._log_startup_completion()
 
     @classmethod
-    def _launch_and_monitor_server(cls, world_id: str, command: str) -> bool:
+    def _launch_and_monitor_server(cls, world_id: str, command: str, root_path: str) -> bool:
         """启动服务器并监控日志文件判断是否启动成功（完全独立进程）"""
         max_retries = 3  # 最大重试次数
         retry_count = 0
         server_ready = False
-        ready_patterns = [
-            "Server has completed startup and is now advertising for join",
-            "Server has completed",
-            "Server is ready",
-            "is now advertising for join"
-        ]
-        error_patterns = [
-            "Error querying server mods: ApiError: Failed (serverUnreachable)",
-            "Error querying server mods",
-            "Failed (serverUnreachable)",
-            # 可以添加其他需要监控的错误模式
-        ]
-        log_file = Path(ins_server_setting.root_path) / "ShooterGame" / "Saved" / "Logs" / f"{world_id}_server_tool.log"
+        log_file = Path(root_path) / "ShooterGame" / "Saved" / "Logs" / f"{world_id}_server_tool.log"
 
         # 如果存在，则删除
         if log_file.exists():
@@ -340,87 +560,99 @@ class OpenServer:
             retry_count += 1
             if retry_count > 1:
                 cls._log(
-                    f"尝试重启服务器 {world_id} (第 {retry_count} 次) (Attempting to restart server {world_id} (attempt {retry_count}))",
+                    "尝试重启服务器 %s (第 %s 次) (Attempting to restart server %s (attempt %s))",
+                    world_id, retry_count, world_id, retry_count,
                     warning=True)
                 time.sleep(5)  # 重启前短暂等待
 
             try:
                 log_file.unlink(missing_ok=True)
-                # 配置启动信息使进程完全独立
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = subprocess.SW_HIDE
-
-                # 启动完全独立的服务器进程
+                # 启动完全独立的服务器进程（不经过 cmd.exe，命令行原样交给 CreateProcess）
                 proc = subprocess.Popen(
                     command,
-                    shell=True,
                     stdin=subprocess.DEVNULL,
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
                     close_fds=True,
-                    creationflags=(
-                            subprocess.CREATE_NEW_PROCESS_GROUP |
-                            subprocess.DETACHED_PROCESS |
-                            subprocess.CREATE_NO_WINDOW
-                    ),
-                    startupinfo=startupinfo
+                    creationflags=_CREATION_FLAGS,
+                    startupinfo=_STARTUPINFO
                 )
 
-                # 只记录PID，不保持进程引用
-                cls._processes[world_id] = {"pid": proc.pid}
-                cls._log(f"服务器 {world_id} 已启动 (PID: {proc.pid}) (Server {world_id} started with PID: {proc.pid})")
+                # 只记录PID、进程句柄和作业对象，不保持进程引用；作业对象不随本工具退出而终止服务器
+                # 保存句柄对象本身使其保持打开，存活检查不必每次 OpenProcess
+                cls._processes[world_id] = {
+                    "pid": proc.pid,
+                    "handle": getattr(proc, "_handle", None),
+                    "job": cls._attach_job(proc),
+                }
+                cls._log("服务器 %s 已启动 (PID: %s) (Server %s started with PID: %s)", world_id, proc.pid, world_id, proc.pid)
                 # 立即释放进程引用，使子进程完全独立
                 proc = None
 
-                # 监控日志文件判断启动状态
-                start_time = time.time()
-                last_log_size = 0
+                # 监控日志文件判断启动状态：监视日志目录，日志有写入时立即读取新增内容，
+                # 否则每 check_interval 秒检查一次进程是否存活；日志文件出现后只打开一次，
+                # 每次把文件映射到内存，只匹配新增的部分
+                start_time = time.monotonic()
                 max_wait_time = cls._server_ready_timeout
                 check_interval = 5  # 检查间隔(秒)
+                log_changed = threading.Event()
+                log_target = os.path.normcase(str(log_file))
+                log_fd = None
+                last_log_size = 0
+                os.makedirs(log_file.parent, exist_ok=True)
                 cls._log("正在等待服务器就绪(Waiting for server ready)...")
 
-                while time.time() - start_time < max_wait_time:
-                    # 检查进程是否仍然存活
-                    if world_id not in cls._processes or not cls._is_process_alive(cls._processes[world_id]["pid"]):
-                        cls._log(f"服务器进程已意外终止 (Server process terminated unexpectedly)", warning=True)
-                        break
-
-                    # 检查日志文件
-                    if log_file.exists():
-                        try:
-                            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                                # 只读取新增的日志内容
-                                f.seek(last_log_size)
-                                new_content = f.read()
-                                last_log_size = f.tell()
-                        except Exception as e:
-                            cls._log(f"读取日志文件失败, 等待日志...(Failed to read log file, wait for log)")
-                            time.sleep(check_interval)
-                            continue
-
-                        # 检查服务器就绪标志
-                        if any(pattern in new_content for pattern in ready_patterns):
-                            server_ready = True
-                            cls._log(f"服务器 {world_id} 已就绪 (Server {world_id} is ready)")
-                            break
-
-                        # 检查错误日志
-                        if any(error_pattern in new_content for error_pattern in error_patterns):
-                            cls._log(
-                                "获取模组服务失败，尝试重启服务器，如果频繁出现此问题，请前往本工具的模组配置页面一键安装证书...\n"
-                                "Failed to query mod service, attempting to restart server. If this occurs frequently, "
-                                "please go to the mod configuration page of this tool to install the certificate with one click...",
-                                error=True
-                            )
-                            # 强制终止当前进程并重启
-                            pid = cls._processes[world_id]["pid"]
-                            subprocess.run(f"taskkill /F /T /PID {pid}", shell=True, check=True)
-                            del cls._processes[world_id]
-                            raise RuntimeError("Mod service error detected, restarting server")
-
-
-                    time.sleep(check_interval)
+                try:
+                    with watch_directory(str(log_file.parent), log_changed,
+                                         lambda e: os.path.normcase(e.src_path) == log_target):
+                        while time.monotonic() - start_time < max_wait_time:
+                            # 检查进程是否仍然存活
+                            info = cls._processes.get(world_id)
+                            if info is None or not cls._is_process_alive(info["pid"], info["handle"]):
+                                cls._log("服务器进程已意外终止 (Server process terminated unexpectedly)", warning=True)
+                                break
+
+                            # 先清除事件再读取，读取期间的写入会在下一次等待时立即唤醒
+                            log_changed.clear()
+                            found = None
+                            try:
+                                if log_fd is None and log_file.exists():
+                                    log_fd = os.open(str(log_file), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+                                if log_fd is not None:
+                                    log_size = os.fstat(log_fd).st_size
+                                    if log_size > last_log_size:
+                                        with mmap.mmap(log_fd, log_size, access=mmap.ACCESS_READ) as m:
+                                            found = {match.lastgroup for match in _LOG_PATTERN_RE.finditer(
+                                                m, max(last_log_size - _LOG_PATTERN_TAIL, 0), log_size)}
+                                        last_log_size = log_size
+                            except OSError:
+                                cls._log("读取日志文件失败, 等待日志...(Failed to read log file, wait for log)")
+
+                            if found:
+
+                                # 检查服务器就绪标志
+                                if "ready" in found:
+                                    server_ready = True
+                                    cls._log("服务器 %s 已就绪 (Server %s is ready)", world_id, world_id)
+                                    break
+
+                                # 检查错误日志
+                                if "error" in found:
+                                    cls._log(
+                                        "获取模组服务失败，尝试重启服务器，如果频繁出现此问题，请前往本工具的模组配置页面一键安装证书...\n"
+                                        "Failed to query mod service, attempting to restart server. If this occurs frequently, "
+                                        "please go to the mod configuration page of this tool to install the certificate with one click...",
+                                        error=True
+                                    )
+                                    # 强制终止当前进程并重启
+                                    cls._kill_server(world_id)
+                                    del cls._processes[world_id]
+                                    raise RuntimeError("Mod service error detected, restarting server")
+
+                            log_changed.wait(check_interval)
+                finally:
+                    if log_fd is not None:
+                        os.close(log_fd)
 
                 if server_ready:
                     return True
@@ -429,7 +661,7 @@ class OpenServer:
                 try:
                     if world_id in cls._processes:
                         pid = cls._processes[world_id]["pid"]
-                        subprocess.run(f"taskkill /F /T /PID {pid}", shell=True, check=True)
+                        cls._kill_server(world_id)
                         cls._log(
                             f"强制终止超时服务器进程 (PID: {pid}) (Force killed timeout server process (PID: {pid}))")
                 except:
@@ -454,15 +686,12 @@ class OpenServer:
         return server_ready
 
     @classmethod
-    def _is_process_alive(cls, pid: int) -> bool:
-        """检查指定PID的进程是否仍在运行"""
+    def _is_process_alive(cls, pid: int, handle=None) -> bool:
+        """检查指定PID的进程是否仍在运行，有启动时保存的句柄则直接等待该句柄"""
         try:
-            # Windows系统使用tasklist命令检查
-            result = subprocess.run(f'tasklist /FI "PID eq {pid}"',
-                                    shell=True,
-                                    capture_output=True,
-                                    text=True)
-            return str(pid) in result.stdout
+            if win_process.available:
+                return win_process.is_process_alive(pid, handle)
+            return psutil.pid_exists(pid)
         except Exception:
             return False
 
@@ -479,36 +708,36 @@ class OpenServer:
             cls._processes.clear()
 
     @classmethod
-    def _get_server_executable(cls) -> str:
+    def _get_server_executable(cls, root_path: str) -> str:
         """获取服务器可执行文件路径"""
         return os.path.join(
-            ins_server_setting.root_path,
+            root_path,
             "ShooterGame", "Binaries", "Win64", "ArkAscendedServer.exe"
         )
 
     @classmethod
-    def _get_server_settings_file(cls) -> str:
+    def _get_server_settings_file(cls, root_path: str) -> str:
         """获取服务器配置文件路径"""
         return os.path.join(
-            ins_server_setting.root_path,
+            root_path,
             "ShooterGame", "Saved", "Config", "WindowsServer", "GameUserSettings.ini"
         )
 
     @classmethod
-    def _get_server_game_settings_file(cls) -> str:
+    def _get_server_game_settings_file(cls, root_path: str) -> str:
         """获取服务器配置文件路径"""
         return os.path.join(
-            ins_server_setting.root_path,
+            root_path,
             "ShooterGame", "Saved", "Config", "WindowsServer", "Game.ini"
         )
 
     @classmethod
-    def _write_game_user_settings(cls) -> bool:
+    def _write_game_user_settings(cls, root_path: str) -> bool:
         '''将非serversettings的模组内容写入Config
         Write non-serversettings mod content to Config'''
         # 处理GameUserSettings.ini
-        settings_file = cls._get_server_settings_file()
-        game_file = cls._get_server_game_settings_file()
+        settings_file = cls._get_server_settings_file(root_path)
+        game_file = cls._get_server_game_settings_file(root_path)
 
         success = False
 
@@ -516,19 +745,14 @@ class OpenServer:
         cls._log("正在写入GameUserSettings.ini部分配置(Writing configuration for GameUserSettings.ini section...)...")
         if os.path.exists(settings_file):
             try:
-                config = configparser.ConfigParser(strict=False)
+                config = configparser.RawConfigParser(strict=False)
                 config.optionxform = str
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    config.read_file(f)
+                config.read(settings_file, encoding='utf-8')
 
-                all_section = ins_game_setting.get_all_section()
-                for section_name in all_section:
-                    if "_ARKToolTip" in section_name:
-                        continue
+                for section_name, (section_data, _) in ins_game_setting.get_sections_with_tips().items():
                     if section_name == "ServerSettings":
                         continue
 
-                    section_data = ins_game_setting.get_section(section_name)
                     if not section_data:
                         continue
 
@@ -538,8 +762,7 @@ class OpenServer:
                     for key, value in section_data.items():
                         config[section_name][key] = value
 
-                with open(settings_file, 'w', encoding="utf-8") as f:
-                    config.write(f)
+                cls._write_config(settings_file, config)
                 success = True
             except Exception as e:
                 cls._log(f"写入GameUserSettings.ini失败(Failed to write GameUserSettings.ini): {str(e)}")
@@ -547,67 +770,75 @@ class OpenServer:
         # 处理Game.ini
         cls._log("正在写入Game.ini部分配置(Writing configuration for Game.ini section...)...")
         try:
-            config = configparser.ConfigParser(strict=False)
+            config = configparser.RawConfigParser(strict=False)
             config.optionxform = str
 
-            # 如果文件存在则读取现有内容
-            if os.path.exists(game_file):
-                with open(game_file, 'r', encoding='utf-8') as f:
-                    config.read_file(f)
+            # 读取现有内容，文件不存在时 read() 直接跳过
+            config.read(game_file, encoding='utf-8')
 
             # 写入Game.ini配置
-            all_section = ins_game_ini_setting.get_all_section()
-            has_changes = False
-
-            for section_name in all_section:
-                if "_ARKToolTip" in section_name:
-                    continue
-
-                section_data = ins_game_ini_setting.get_section(section_name)
+            for section_name, (section_data, _) in ins_game_ini_setting.get_sections_with_tips().items():
                 if not section_data:
                     continue
 
                 if not config.has_section(section_name):
                     config.add_section(section_name)
-                    has_changes = True
 
                 for key, value in section_data.items():
-                    if config.get(section_name, key, fallback=None) != value:
-                        config[section_name][key] = value
-                        has_changes = True
+                    config[section_name][key] = value
 
-            # 只有有变更或文件不存在时才写入
-            if has_changes or not os.path.exists(game_file):
-                # 确保目录存在
-                os.makedirs(os.path.dirname(game_file), exist_ok=True)
-
-                with open(game_file, 'w', encoding="utf-8") as f:
-                    config.write(f)
-                success = True
+            # 确保目录存在；内容与磁盘相同时 _write_config 不会写入
+            os.makedirs(os.path.dirname(game_file), exist_ok=True)
+            cls._write_config(game_file, config)
+            success = True
 
         except Exception as e:
             cls._log(f"写入Game.ini失败(Failed to write Game.ini): {str(e)}")
 
         return success
 
+    @staticmethod
+    def _write_config(file_path: str, config: configparser.RawConfigParser) -> bool:
+        """先序列化到内存，与磁盘内容相同时跳过写入，否则一次性原子写入，写到一半被中断也不会留下残缺的INI
+
+        :return: 是否写入了文件
+        """
+        buf = io.StringIO()
+        config.write(buf)
+        data = buf.getvalue().encode('utf-8')
+        try:
+            if os.path.getsize(file_path) == len(data):
+                with open(file_path, 'rb') as f:
+                    if f.read() == data:
+                        return False
+        except FileNotFoundError:
+            pass
+        atomic_write(file_path, data)
+        return True
+
     @classmethod
-    def _build_server_command(cls, world_id: str, world_data: Dict[str, Any], server_exe: str) -> str:
-        """构建完整的服务器启动命令"""
-        world_params = cls._get_world_config(world_data["world_set"])
+    def _build_server_command(cls, world_id: str, world_data: Dict[str, Any], snap: _ServerSnap,
+                              parts: _CommandParts, world_params: Optional[str] = None) -> str:
+        """构建完整的服务器启动命令
+
+        启动多个世界时可传入已解析好的世界配置，未传入时现场解析。
+        """
+        if world_params is None:
+            world_params = cls._get_world_config(world_data["world_set"])
         server_params = cls._get_server_params(
             world_data["port"],
             world_data["rcon_port"],
-            world_data["session_name"]
+            world_data["session_name"],
+            snap
         )
-        extra_params = cls._get_extra_params()
-        mods_params = cls._get_mods_params()
 
-        return (
-            f'"{server_exe}" '
-            f'{world_id}?listen?{world_params}?{server_params} '
-            f'{extra_params} {mods_params} '
-            f"-log={world_id}_server_tool.log"
-        )
+        return " ".join((
+            parts.quoted_exe,
+            f"{world_id}?listen?{world_params}?{server_params}",
+            parts.extra_params,
+            parts.mods_params,
+            f"-log={world_id}_server_tool.log",
+        ))
 
     @classmethod
     def _terminate_process(cls, process):
@@ -615,11 +846,11 @@ class OpenServer:
         try:
             process.terminate()
             process.wait(timeout=10)
-            cls._log(f"已成功终止进程 (PID: {process.pid}) (Successfully terminated process (PID: {process.pid}))")
+            cls._log("已成功终止进程 (PID: %s) (Successfully terminated process (PID: %s))", process.pid, process.pid)
         except:
             try:
                 process.kill()
-                cls._log(f"已强制终止进程 (PID: {process.pid}) (Force killed process (PID: {process.pid}))")
+                cls._log("已强制终止进程 (PID: %s) (Force killed process (PID: %s))", process.pid, process.pid)
             except:
                 cls._log(f"终止进程失败 (PID: {process.pid}) (Failed to terminate process (PID: {process.pid}))",
                          error=True)
@@ -628,49 +859,48 @@ class OpenServer:
     def _get_world_config(cls, world_set: str) -> str:
         """获取世界配置参数"""
         file_path = f"config/game_settings/{world_set}.ini"
-        if not os.path.exists(file_path):
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             cls._log(f"配置文件未找到！{world_set}.ini (Configuration file not found: {world_set}.ini)", error=True)
             raise FileNotFoundError(f"Config file not found: {world_set}.ini")
 
-        config = configparser.ConfigParser()
-        with open(file_path, 'r', encoding='utf-8') as f:
-            config.read_file(f)
+        server_settings = _load_world_settings(file_path, st.st_mtime_ns, st.st_size)
 
-        if 'ServerSettings' not in config:
+        if server_settings is None:
             cls._log(f"{world_set}.ini 没有 ServerSettings 段 ({world_set}.ini has no ServerSettings section)",
                      warning=True)
             return ""
 
-        server_settings = config['ServerSettings']
-        return "?".join(f"{k}={v}" for k, v in server_settings.items())
+        return "?".join(f"{k}={v}" for k, v in server_settings)
 
     @classmethod
-    def _get_server_params(cls, port: int, rcon_port: int, session_name: str) -> str:
+    def _get_server_params(cls, port: int, rcon_port: int, session_name: str, snap: _ServerSnap) -> str:
         """获取服务器基本参数"""
         return (
             f"Port={port}?"
             f"RCONPort={rcon_port}?"
-            f"MaxPlayers={ins_server_setting.max_player}?"
+            f"MaxPlayers={snap.max_player}?"
             f"SessionName={session_name}?"
-            f"ServerPassword={ins_server_setting.server_pwd}?"
-            f"ServerAdminPassword={ins_server_setting.admin_pwd}"
+            f"ServerPassword={snap.server_pwd}?"
+            f"ServerAdminPassword={snap.admin_pwd}"
         )
 
     @classmethod
-    def _get_extra_params(cls) -> str:
+    def _get_extra_params(cls, snap: _ServerSnap) -> str:
         """获取额外参数"""
         params = []
-        if not ins_server_setting.be_open:
+        if not snap.be_open:
             params.append("-NoBattlEye")
-        if ins_server_setting.more_worlds_open:
-            params.append(f"-ClusterID={ins_server_setting.cluster_id}")
-            params.append(f'-ClusterDirOverride="{ins_server_setting.cluster_path}"')
+        if snap.more_worlds_open:
+            params.append(f"-ClusterID={snap.cluster_id}")
+            params.append(f'-ClusterDirOverride="{snap.cluster_path}"')
         return " ".join(params)
 
     @classmethod
-    def _get_mods_params(cls) -> str:
+    def _get_mods_params(cls, snap: _ServerSnap) -> str:
         """获取Mod参数"""
-        if not ins_server_setting.mods_open:
+        if not snap.mods_open:
             return ""
 
         mod_ids = [
@@ -700,10 +930,10 @@ class OpenServer:
             "服务器启动完成！等待全部弹出的黑色窗口左下角变成绿色标记并且提示Server Ready即可！(Server startup completed! Wait for all console windows to show green 'Server Ready' indicator!)")
 
     @classmethod
-    def _log(cls, message: str, warning: bool = False, error: bool = False):
-        """统一的日志记录方法"""
-        log_type = "WARNING" if warning else ("ERROR" if error else "INFO")
-        ins_tool_logger.add_log(f"{message}", log_type)
+    def _log(cls, message: str, *args, warning: bool = False, error: bool = False):
+        """统一的日志记录方法，传入 args 时 message 为 % 格式模板，由日志器按需格式化"""
+        log_type = "warning" if warning else ("error" if error else "info")
+        ins_tool_logger.add_log(message, *args, log_type=log_type)
 
     @classmethod
     def boxed_text(cls, text, padding=1, border_char='#'):
@@ -0,0 +1,90 @@
+import ctypes
+import sys
+from typing import Optional
+
+# Windows 作业对象（Job Object）：进程树中的所有进程可由一次 TerminateJobObject 调用同时终止
+# 非Windows平台上所有函数均不可用，调用方需回退到psutil
+
+_JobObjectExtendedLimitInformation = 9
+JOB_OBJECT_LIMIT_BREAKAWAY_OK = 0x00000800
+JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x00002000
+
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    class _IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_ulonglong) for name in (
+            "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+            "ReadTransferCount", "WriteTransferCount", "OtherTransferCount")]
+
+    class _JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+
+    class _JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", _JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", _IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateJobObjectW.argtypes = (wintypes.LPVOID, wintypes.LPCWSTR)
+    _kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    _kernel32.SetInformationJobObject.argtypes = (wintypes.HANDLE, ctypes.c_int, wintypes.LPVOID, wintypes.DWORD)
+    _kernel32.SetInformationJobObject.restype = wintypes.BOOL
+    _kernel32.AssignProcessToJobObject.argtypes = (wintypes.HANDLE, wintypes.HANDLE)
+    _kernel32.AssignProcessToJobObject.restype = wintypes.BOOL
+    _kernel32.TerminateJobObject.argtypes = (wintypes.HANDLE, wintypes.UINT)
+    _kernel32.TerminateJobObject.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+else:
+    _kernel32 = None
+
+
+def create_job(kill_on_close: bool = False) -> Optional[int]:
+    """
+    创建作业对象
+    :param kill_on_close: 为True时最后一个句柄关闭（包括本工具退出）会终止作业中的所有进程
+    :return: 作业句柄，不可用时返回None
+    """
+    if _kernel32 is None:
+        return None
+    job = _kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return None
+    info = _JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+    info.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_BREAKAWAY_OK | (
+        JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE if kill_on_close else 0)
+    if not _kernel32.SetInformationJobObject(
+            job, _JobObjectExtendedLimitInformation, ctypes.byref(info), ctypes.sizeof(info)):
+        _kernel32.CloseHandle(job)
+        return None
+    return job
+
+
+def assign_process(job: int, process_handle: int) -> bool:
+    """把进程加入作业，之后由它创建的子进程也自动属于该作业"""
+    return bool(_kernel32.AssignProcessToJobObject(job, int(process_handle)))
+
+
+def terminate_job(job: int, exit_code: int = 1) -> bool:
+    """终止作业中的所有进程"""
+    return bool(_kernel32.TerminateJobObject(job, exit_code))
+
+
+def close_job(job: int) -> None:
+    _kernel32.CloseHandle(job)
@@ -0,0 +1,41 @@
+import ctypes
+import sys
+from typing import Optional
+
+# 通过进程句柄判断进程是否存活，无需启动 tasklist 子进程
+# 非Windows平台上 available 为False，调用方需回退到psutil
+
+_SYNCHRONIZE = 0x00100000
+_WAIT_TIMEOUT = 0x00000102
+
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+    _kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+    available = True
+else:
+    _kernel32 = None
+    available = False
+
+
+def is_process_alive(pid: int, handle: Optional[int] = None) -> bool:
+    """
+    检查进程是否仍在运行
+    :param pid: 进程PID，未提供句柄时用它打开进程
+    :param handle: 启动进程时得到的句柄（如 Popen._handle），提供时直接等待该句柄
+    """
+    if handle is not None:
+        return _kernel32.WaitForSingleObject(int(handle), 0) == _WAIT_TIMEOUT
+    h = _kernel32.OpenProcess(_SYNCHRONIZE, False, pid)
+    if not h:
+        return False
+    try:
+        return _kernel32.WaitForSingleObject(h, 0) == _WAIT_TIMEOUT
+    finally:
+        _kernel32.CloseHandle(h)
@@ -18,8 +18,9 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
 from PySide6.QtWidgets import (QApplication, QCheckBox, QComboBox, QDialog,
     QGridLayout, QGroupBox, QHBoxLayout, QHeaderView,
     QLabel, QLineEdit, QPushButton, QSizePolicy,
-    QSpacerItem, QSpinBox, QTabWidget, QTableWidget,
-    QTableWidgetItem, QTextEdit, QVBoxLayout, QWidget)
+    QSpacerItem, QSpinBox, QTabWidget, QTableView,
+    QTableWidget, QTableWidgetItem, QTextEdit, QVBoxLayout,
+    QWidget)
 
 class Ui_MainPage(object):
     def setupUi(self, MainPage):
@@ -477,7 +478,7 @@ class Ui_MainPage(object):
         self.gridLayout_5.setObjectName(u"gridLayout_5")
         self.verticalLayout_3 = QVBoxLayout()
         self.verticalLayout_3.setObjectName(u"verticalLayout_3")
-        self.choose_world_show = QTableWidget(self.groupBox_2)
+        self.choose_world_show = QTableView(self.groupBox_2)
         self.choose_world_show.setObjectName(u"choose_world_show")
 
         self.verticalLayout_3.addWidget(self.choose_world_show)
@@ -637,7 +638,7 @@ class Ui_MainPage(object):
 
         self.verticalLayout_5.addLayout(self.horizontalLayout_12)
 
-        self.wc_show_world_setting = QTableWidget(self.groupBox_3)
+        self.wc_show_world_setting = QTableView(self.groupBox_3)
         self.wc_show_world_setting.setObjectName(u"wc_show_world_setting")
 
         self.verticalLayout_5.addWidget(self.wc_show_world_setting)